@@ -1,72 +1,190 @@
 """The GroupAlarm.com component."""
 
-import asyncio
+from datetime import timedelta
 import logging
+from time import monotonic
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ACCESS_TOKEN, CONF_NAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_NAME,
+    CONF_URL,
+    CONF_WEBHOOK_ID,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.storage import Store
 
-from .connector import GroupAlarmData
 from .const import (
-    DEFAULT_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_ORGANIZATION_CONCURRENCY,
+    CONF_ORGANIZATIONS,
+    CONF_PAGE_SIZE,
+    CONF_PUSH_MODE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_ORGANIZATION_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
     DOMAIN,
     GROUPALARM_COORDINATOR,
     GROUPALARM_DATA,
+    GROUPALARM_HUB,
     GROUPALARM_NAME,
+    GROUPALARM_URL,
+    HISTORY_STORAGE_KEY,
+    PUSH_RECONCILE_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SELECT, Platform.SENSOR]
+PLATFORMS = [Platform.CALENDAR, Platform.SELECT, Platform.SENSOR]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up GroupAlarm as config entry."""
+    started = monotonic()
+
+    # Imported here, so loading the integration for its config flow does not
+    # pull in the connector and its dependencies
+    from .connector import GroupAlarmData
+    from .coordinator import GroupAlarmCoordinator
+    from .hub import async_get_hub
+    from .push import async_register_webhook
 
     # Load values from settings
     access_token = entry.data[CONF_ACCESS_TOKEN]
     site_name = entry.data[CONF_NAME]
 
-    groupalarm_data = GroupAlarmData(hass, access_token)
+    await _async_migrate_unique_ids(hass, entry)
+    _async_migrate_device(hass, entry)
 
-    # Update data initially
-    await groupalarm_data.async_update()
-    if not groupalarm_data.success:
-        raise ConfigEntryNotReady()
+    groupalarm_hub = async_get_hub(hass)
+    groupalarm_data = GroupAlarmData(
+        hass,
+        access_token,
+        hub=groupalarm_hub,
+        page_size=entry.options.get(CONF_PAGE_SIZE, DEFAULT_PAGE_SIZE),
+        url=entry.data.get(CONF_URL, GROUPALARM_URL),
+        organization_ids=[
+            int(organization_id)
+            for organization_id in entry.options.get(CONF_ORGANIZATIONS, [])
+        ],
+        organization_concurrency=entry.options.get(
+            CONF_ORGANIZATION_CONCURRENCY, DEFAULT_ORGANIZATION_CONCURRENCY
+        ),
+    )
+
+    push_mode = entry.options.get(CONF_PUSH_MODE, False)
+    max_interval = timedelta(
+        seconds=entry.options.get(
+            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL.total_seconds()
+        )
+    )
+    if push_mode:
+        # New alarms are pushed, polling only reconciles while idle
+        max_interval = max(max_interval, PUSH_RECONCILE_INTERVAL)
 
     # Coordinator checks for new updates
-    groupalarm_coordinator = DataUpdateCoordinator(
+    groupalarm_coordinator = GroupAlarmCoordinator(
         hass,
-        _LOGGER,
+        groupalarm_data,
+        groupalarm_hub,
         name=f"GroupAlarm Coordinator for {site_name}",
-        update_method=groupalarm_data.async_update,
-        update_interval=DEFAULT_SCAN_INTERVAL,
+        min_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL.total_seconds()
+            )
+        ),
+        max_interval=max_interval,
+        store=Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)),
+        history_store=Store(
+            hass, STORAGE_VERSION, HISTORY_STORAGE_KEY.format(entry.entry_id)
+        ),
     )
 
     # Save the data
-    groupalarm_hass_data = hass.data.setdefault(DOMAIN, {})
+    groupalarm_hass_data = hass.data[DOMAIN]
     groupalarm_hass_data[entry.entry_id] = {
         GROUPALARM_DATA: groupalarm_data,
         GROUPALARM_COORDINATOR: groupalarm_coordinator,
         GROUPALARM_NAME: site_name,
     }
 
-    # Fetch initial data so we have data when entities subscribe
-    await groupalarm_coordinator.async_refresh()
-    if not groupalarm_data.success:
-        raise ConfigEntryNotReady()
-
-    for component in PLATFORMS:
-        hass.async_create_task(
-            hass.config_entries.async_forward_entry_setup(entry, component)
+    # Entities start from the persisted data if there is any, the first
+    # refresh then runs in the background
+    if await groupalarm_coordinator.async_restore():
+        entry.async_create_background_task(
+            hass,
+            groupalarm_coordinator.async_refresh(),
+            f"GroupAlarm initial refresh for {site_name}",
+        )
+    else:
+        try:
+            await groupalarm_coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            # The setup is retried from scratch, do not keep this attempt
+            _async_pop_entry_data(hass, entry)
+            raise
+
+    if push_mode:
+        async_register_webhook(
+            hass, entry, groupalarm_coordinator, entry.options[CONF_WEBHOOK_ID]
         )
 
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    _LOGGER.debug(
+        "Setup of %s took %.0f ms", site_name, (monotonic() - started) * 1000
+    )
     return True
 
 
+async def _async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry):
+    """Fix sensor unique ids that were created without the entry name.
+
+    Older versions created ids like ``None_mvpga_start``, which collide as
+    soon as more than one access key is configured.
+    """
+    prefix = f"{DOMAIN}_{entry.data[CONF_NAME]}"
+
+    @callback
+    def _migrate(entity_entry: er.RegistryEntry):
+        if entity_entry.unique_id.startswith("None_mvpga_"):
+            return {
+                "new_unique_id": prefix + entity_entry.unique_id.removeprefix("None")
+            }
+        return None
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate)
+
+
+@callback
+def _async_migrate_device(hass: HomeAssistant, entry: ConfigEntry):
+    """Give the device shared by all entries in older versions to this entry.
+
+    The device keeps its id, so the entities stay assigned to it. With
+    several entries, the others get a device of their own.
+    """
+    registry = dr.async_get(hass)
+    if (device := registry.async_get_device(identifiers={(DOMAIN, "TODO")})) is None:
+        return
+    identifiers = {(DOMAIN, entry.data[CONF_NAME])}
+    if registry.async_get_device(identifiers=identifiers) is None:
+        registry.async_update_device(device.id, new_identifiers=identifiers)
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_migrate_entry(hass, config_entry: ConfigEntry):
     """Migrate old entry."""
     _LOGGER.debug("Migrating from version %s", config_entry.version)
@@ -81,25 +199,23 @@ async def async_migrate_entry(hass, config_entry: ConfigEntry):
     return True
 
 
-async def async_update(self):
-    """Async wrapper for update method."""
-    return await self._hass.async_add_executor_job(self._update)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the persisted data of a removed config entry."""
+    for key in (STORAGE_KEY, HISTORY_STORAGE_KEY):
+        await Store(hass, STORAGE_VERSION, key.format(entry.entry_id)).async_remove()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
-    hass.services.async_remove(DOMAIN)
-
-    unload_ok = all(
-        await asyncio.gather(
-            *[
-                hass.config_entries.async_forward_entry_unload(entry, component)
-                for component in PLATFORMS
-            ]
-        )
-    )
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-        if not hass.data[DOMAIN]:
-            hass.data.pop(DOMAIN)
+        _async_pop_entry_data(hass, entry)
     return unload_ok
+
+
+@callback
+def _async_pop_entry_data(hass: HomeAssistant, entry: ConfigEntry):
+    """Drop the data of an entry, and of the domain with its last entry."""
+    hass.data[DOMAIN].pop(entry.entry_id, None)
+    if hass.data[DOMAIN].keys() <= {GROUPALARM_HUB}:
+        hass.data.pop(DOMAIN)
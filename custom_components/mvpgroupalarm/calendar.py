@@ -0,0 +1,110 @@
+"""Calendar of past and running GroupAlarm alarms."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.helpers.typing import ConfigType, HomeAssistantType
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .entity import GroupAlarmEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+# Calendar events need an end, running alarms are shown until this long
+# after now.
+RUNNING_ALARM_DURATION = timedelta(hours=1)
+MIN_EVENT_DURATION = timedelta(minutes=1)
+
+
+async def async_setup_entry(
+    hass: HomeAssistantType, entry: ConfigType, async_add_entities
+) -> None:
+    """Set up the GroupAlarm calendar platform."""
+    hass_data = hass.data[DOMAIN][entry.entry_id]
+    _LOGGER.debug("Calendar async_setup_entry")
+    async_add_entities([GroupAlarmCalendar(hass_data)], False)
+
+
+class GroupAlarmCalendar(GroupAlarmEntity, CalendarEntity):
+    """Calendar showing the alarm history of the connector."""
+
+    _attr_name = "mvp-ga-Alarms"
+    _attr_icon = "mdi:calendar-alert"
+
+    def __init__(self, hass_data):
+        """Initialize the calendar."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_calendar"
+
+    @property
+    def event(self):
+        """Return the newest running alarm."""
+        if not self._connector.active_alarms:
+            return None
+        snapshot = max(
+            self._connector.active_alarms.values(), key=lambda alarm: alarm.start
+        )
+        return _calendar_event(
+            snapshot.id,
+            snapshot.start,
+            snapshot.end,
+            snapshot.event,
+            snapshot.message,
+            snapshot.organization,
+            dt_util.utcnow(),
+        )
+
+    def _written_state(self):
+        """Compare the running alarm itself, its event end moves with time."""
+        event = self.event
+        return (
+            self.available,
+            self.state,
+            None if event is None else (event.uid, event.start, event.summary),
+        )
+
+    async def async_get_events(
+        self, hass: HomeAssistantType, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the alarms within a datetime range."""
+        now = dt_util.utcnow()
+        return [
+            _calendar_event(
+                alarm.id,
+                alarm.start,
+                alarm.end,
+                alarm.event,
+                alarm.message,
+                self._connector.get_organization_name_by_id(alarm.organization_id),
+                now,
+            )
+            for alarm in self._connector.history.between(start_date, end_date, now)
+        ]
+
+
+def _calendar_event(
+    alarm_id: int,
+    start: datetime,
+    end: datetime | None,
+    event: str | None,
+    message: str | None,
+    organization: str | None,
+    now: datetime,
+) -> CalendarEvent:
+    """Return the calendar event of an alarm."""
+    if end is None:
+        end = max(start, now) + RUNNING_ALARM_DURATION
+    else:
+        end = max(end, start + MIN_EVENT_DURATION)
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=event or message or str(alarm_id),
+        description=message,
+        location=organization,
+        uid=str(alarm_id),
+    )
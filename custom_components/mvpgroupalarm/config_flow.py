@@ -1,14 +1,32 @@
 """Config flow for GroupAlarm 24/7 integration."""
 
+import asyncio
 import logging
 
+import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries, core, exceptions
-from homeassistant.const import CONF_ACCESS_TOKEN, CONF_NAME
+from homeassistant.components import webhook
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_NAME, CONF_URL, CONF_WEBHOOK_ID
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
 
-from .connector import GroupAlarmData
 from .const import (
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_ORGANIZATION_CONCURRENCY,
+    CONF_ORGANIZATIONS,
+    CONF_PAGE_SIZE,
+    CONF_PUSH_MODE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_ORGANIZATION_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
     DOMAIN,
+    GROUPALARM_DATA,
+    GROUPALARM_URL,
+    VALIDATION_TIMEOUT,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -18,14 +36,26 @@ async def validate_input(hass: core.HomeAssistant, data):
     """Validate the user input.
 
     Data has the keys from DATA_SCHEMA with values provided by the user.
+    Only the user profile is fetched, with a short timeout and without
+    retries; alarms and organizations are left to the setup of the entry.
     """
     api_key = data[CONF_ACCESS_TOKEN]
-
-    groupalarm_data = GroupAlarmData(hass, api_key)
-    await groupalarm_data.async_update()
-    if not groupalarm_data.success:
-        raise CannotConnect()
-    return {"unique_id": groupalarm_data.get_user()["email"], CONF_ACCESS_TOKEN: api_key}
+    url = data.get(CONF_URL, GROUPALARM_URL)
+
+    try:
+        async with async_get_clientsession(hass).get(
+            url + "/user",
+            headers={"Personal-Access-Token": api_key},
+            timeout=aiohttp.ClientTimeout(total=VALIDATION_TIMEOUT),
+        ) as response:
+            if response.status in (401, 403):
+                raise InvalidAuth()
+            if response.status != 200:
+                raise CannotConnect()
+            user = await response.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+        raise CannotConnect() from ex
+    return {"unique_id": user["email"], CONF_ACCESS_TOKEN: api_key}
 
 
 class GroupAlarmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -43,6 +73,8 @@ class GroupAlarmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 info = await validate_input(self.hass, user_input)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -66,6 +98,103 @@ class GroupAlarmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=data_schema, errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return GroupAlarmOptionsFlowHandler(config_entry)
+
+
+class GroupAlarmOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options of a GroupAlarm config entry."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the polling, paging, push and organization options."""
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_scan_interval"
+            else:
+                if user_input[CONF_PUSH_MODE]:
+                    user_input[CONF_WEBHOOK_ID] = self.config_entry.options.get(
+                        CONF_WEBHOOK_ID
+                    ) or webhook.async_generate_id()
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_SCAN_INTERVAL,
+                        DEFAULT_MIN_SCAN_INTERVAL.total_seconds(),
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_MAX_SCAN_INTERVAL,
+                        DEFAULT_MAX_SCAN_INTERVAL.total_seconds(),
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(
+                    CONF_PAGE_SIZE,
+                    default=options.get(CONF_PAGE_SIZE, DEFAULT_PAGE_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+                vol.Required(
+                    CONF_PUSH_MODE,
+                    default=options.get(CONF_PUSH_MODE, False),
+                ): bool,
+                **self._organization_schema(),
+            },
+        )
+
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
+
+    def _organization_schema(self):
+        """Return the schema of the organization options.
+
+        The organizations to choose from are the ones the running entry
+        knows, so they are only offered once it was set up.
+        """
+        options = self.config_entry.options
+        selected = options.get(CONF_ORGANIZATIONS, [])
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        organizations = {
+            organization_id: organization_id for organization_id in selected
+        }
+        if entry_data is not None and entry_data[GROUPALARM_DATA].organizations:
+            organizations.update(
+                (str(organization_id), name)
+                for organization_id, name in entry_data[
+                    GROUPALARM_DATA
+                ].organizations.items()
+            )
+        if not organizations:
+            return {}
+        return {
+            vol.Optional(CONF_ORGANIZATIONS, default=selected): cv.multi_select(
+                organizations
+            ),
+            vol.Required(
+                CONF_ORGANIZATION_CONCURRENCY,
+                default=options.get(
+                    CONF_ORGANIZATION_CONCURRENCY, DEFAULT_ORGANIZATION_CONCURRENCY
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+        }
+
 
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
+
+
+class InvalidAuth(exceptions.HomeAssistantError):
+    """Error to indicate the access key was rejected."""
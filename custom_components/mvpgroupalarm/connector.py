@@ -1,12 +1,54 @@
 """Connector Class for GroupAlarm Data."""
 
+import asyncio
+from contextlib import aclosing, suppress
 from datetime import datetime
 import logging
-import json
-import requests
+from sys import intern
+from time import monotonic
 
-from homeassistant.const import STATE_UNKNOWN, STATE_OFF, STATE_ON
-from .const import DEFAULT_TIMEOUT, GROUPALARM_URL
+import aiohttp
+from aiohttp.hdrs import (
+    ETAG,
+    IF_MODIFIED_SINCE,
+    IF_NONE_MATCH,
+    LAST_MODIFIED,
+    RETRY_AFTER,
+)
+
+from homeassistant.const import STATE_ON
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import (
+    DEFAULT_ORGANIZATION_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_TIMEOUT,
+    GROUPALARM_URL,
+    MAX_PAGES,
+    ORGANIZATION_ALARMS_PATH,
+    ORGANIZATIONS_CACHE_TTL,
+    ORGANIZATIONS_MISS_COOLDOWN,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUSES,
+    STALE_DATA_TTL,
+    USER_CACHE_TTL,
+    USER_STATUS_PATH,
+    USER_STATUSES_PATH,
+)
+from .events import AlarmEventTracker
+from .history import AlarmHistory
+from .hub import GroupAlarmHub
+from .models import (
+    EMPTY_FEEDBACK_INDEX,
+    EMPTY_SNAPSHOT,
+    Alarm,
+    AlarmSnapshot,
+    FeedbackIndex,
+)
+from .retry import CircuitBreaker, CircuitOpenError, parse_retry_after, retry_delay
+from .stats import ConnectorStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,9 +56,23 @@ _LOGGER = logging.getLogger(__name__)
 class GroupAlarmData:
     """helper class for centrally querying the data from GroupAlarm."""
 
-    def __init__(self, hass, api_key, only_own_alarms = True):
+    def __init__(
+        self,
+        hass,
+        api_key,
+        only_own_alarms=True,
+        hub=None,
+        page_size=DEFAULT_PAGE_SIZE,
+        url=GROUPALARM_URL,
+        organization_ids=(),
+        organization_concurrency=DEFAULT_ORGANIZATION_CONCURRENCY,
+    ):
         """Initiate necessary data for the helper class."""
         self._hass = hass
+        self._url = url
+        self._hub = hub or GroupAlarmHub(hass)
+        self._session = self._hub.session
+        self._timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
 
         self.success = False
         self.latest_update = None
@@ -24,185 +80,777 @@ class GroupAlarmData:
         self.alarms = None
         self.user = None
         self.organizations = None
+        self.statuses = None
+        self.snapshot = EMPTY_SNAPSHOT
+        self.feedback_index = EMPTY_FEEDBACK_INDEX
+        self.active_alarms = {}
+        self._parsed_alarms = {}
+
+        self._user_expires = dt_util.utcnow()
+        self._organizations_miss_retry = dt_util.utcnow()
+        self._unresolved_organizations = set()
+        self._cache_refresh_task = None
+        self._shut_down = False
+        self._validators = {}
+        self._received_validators = {}
+
+        self._breaker = CircuitBreaker()
+        self.consecutive_failures = 0
+        self.tracker = AlarmEventTracker(hass)
+        self.history = AlarmHistory()
+        self.history_changed = False
+        self.stats = ConnectorStats()
 
         if api_key != "":
             self.api_key = api_key
         self.only_own_alarms = only_own_alarms != False
+        self.page_size = page_size
+        self.organization_ids = tuple(organization_ids)
+        self._organization_semaphore = asyncio.Semaphore(organization_concurrency)
+        self.request_headers = {"Personal-Access-Token": api_key}
 
     async def async_update(self):
-        """Asynchronous update for all GroupAlarm entities."""
-        return await self._hass.async_add_executor_job(self._update)
+        """Update for all GroupAlarm entities.
 
-    def _update(self):
-        """Update for all GroupAlarm entities."""
-        timestamp = datetime.now()
+        Alarms are fetched on every call. User and organization data are
+        served from a cache and only fetched when missing or expired.
+        """
+        timestamp = dt_util.utcnow()
 
         if not self.api_key:
-            _LOGGER.exception("No update possible")
+            _LOGGER.error("No update possible")
+            return
+
+        started = monotonic()
+        self.stats.start_refresh()
+
+        cold_updates = []
+        if self.user is None:
+            cold_updates.append(self.async_update_user())
+        if self.organizations is None:
+            cold_updates.append(self.async_update_organizations())
+
+        try:
+            # Wait for all requests, so none outlives the update if one fails
+            results = await asyncio.gather(
+                self.request_alarms(), *cold_updates, return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            (status_alarms, alarms), *cold_results = results
+        except CircuitOpenError:
+            _LOGGER.debug("Circuit breaker is open, serving cached data")
+            self._update_failed(None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            self._update_failed(ex)
         else:
-            self.request_headers = {"Personal-Access-Token": self.api_key}
-            try:
-                status_alarms, self.alarms = self.request_alarms()
-                status_user, self.user = self.request_user()
-                status_organization, self.organizations = self.request_organizations()
-
-                self.success = status_alarms == 200 and status_user == 200 and status_organization == 200
-            except requests.exceptions.HTTPError as ex:
-                _LOGGER.error("Error: %s", ex)
-                self.success = False
-            else:
+            if status_alarms == 200 and all(cold_results):
+                self._validators.update(self._received_validators)
+                self.success = True
+                self.consecutive_failures = 0
+                previous = self.alarms
+                self.alarms = alarms
                 self.latest_update = timestamp
-            _LOGGER.debug("Values updated at %s", self.latest_update)
+                self._update_snapshot()
+                self._track_alarms()
+                self._update_history(previous)
+                await self._async_resolve_unknown_organizations()
+                self._schedule_cache_refresh()
+            else:
+                self._update_failed(f"status {status_alarms}")
+
+        self._received_validators.clear()
+        duration = (monotonic() - started) * 1000
+        self.stats.finish_refresh(duration)
+        _LOGGER.debug(
+            "Refresh took %.0f ms, %d requests, %d bytes, %d alarms",
+            duration,
+            self.stats.last_refresh_requests,
+            self.stats.last_refresh_bytes,
+            len(self.alarms or ()),
+        )
+
+    def _update_failed(self, reason):
+        """Handle a failed update, serving cached data while it is fresh.
+
+        Only the first failure in a row is logged as error to keep the log
+        readable during outages.
+        """
+        self.consecutive_failures += 1
+        if reason is not None:
+            if self.consecutive_failures == 1:
+                _LOGGER.error("Error while updating GroupAlarm data: %s", reason)
+            else:
+                _LOGGER.debug("Error while updating GroupAlarm data: %s", reason)
+        self.success = (
+            self.latest_update is not None
+            and dt_util.utcnow() - self.latest_update < STALE_DATA_TTL
+        )
+
+    async def async_update_user(self):
+        """Fetch the user profile into the cache."""
+        status, user = await self.request_user()
+        if status != 200:
+            return False
+        self._set_user(user)
+        self._user_expires = dt_util.utcnow() + USER_CACHE_TTL
+        self._update_snapshot(invalidate=True)
+        return True
+
+    def _set_user(self, user):
+        """Store the fields of the user profile the integration uses."""
+        self.user = {
+            "id": user["id"],
+            "email": user["email"],
+            "name": user["name"],
+            "surname": user["surname"],
+        }
+
+    async def async_update_organizations(self):
+        """Fetch the organization map into the cache."""
+        status, organizations = await self.request_organizations()
+        if status != 200:
+            return False
+        self.organizations = organizations
+        self._hub.update_organizations(
+            organizations, dt_util.utcnow() + ORGANIZATIONS_CACHE_TTL
+        )
+        self._update_snapshot(invalidate=True)
+        return True
+
+    async def _async_resolve_unknown_organizations(self):
+        """Refresh the organization cache if a new alarm references an unknown one.
+
+        Only the first page is checked, as only its alarms are shown.
+        Organizations already resolved by another config entry are taken from
+        the shared map of the hub without another request. Organizations a
+        refresh didn't resolve, e.g. ones the user has left, are remembered
+        and don't trigger another refresh.
+        """
+        unknown = {
+            alarm.organization_id
+            for alarm in self.alarms[: self.page_size]
+            if alarm.organization_id not in self._hub.organizations
+        }
+        now = dt_util.utcnow()
+        if (
+            unknown <= self._unresolved_organizations
+            or now < self._organizations_miss_retry
+        ):
+            return
+
+        self._organizations_miss_retry = now + ORGANIZATIONS_MISS_COOLDOWN
+        _LOGGER.debug("Alarm references an unknown organization, refreshing cache")
+        try:
+            if await self.async_update_organizations():
+                self._unresolved_organizations = unknown - self._hub.organizations.keys()
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as ex:
+            _LOGGER.warning("Error while refreshing organizations: %s", ex)
+
+    def _schedule_cache_refresh(self):
+        """Refresh expired cache entries in the background."""
+        if self._shut_down:
+            return
+        if self._cache_refresh_task is not None and not self._cache_refresh_task.done():
+            return
+
+        now = dt_util.utcnow()
+        updates = []
+        if now >= self._user_expires:
+            updates.append(self.async_update_user)
+        if now >= self._hub.organizations_expires:
+            updates.append(self.async_update_organizations)
+        if updates:
+            self._cache_refresh_task = self._hass.async_create_background_task(
+                self._async_refresh_cache(updates), "mvpgroupalarm cache refresh"
+            )
+
+    async def async_shutdown(self):
+        """Cancel a running background refresh of the cache and wait for it.
+
+        An update still running when the entry is unloaded doesn't start
+        another one.
+        """
+        self._shut_down = True
+        if (task := self._cache_refresh_task) is None:
+            return
+        self._cache_refresh_task = None
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _async_refresh_cache(self, updates):
+        """Run the given cache updates and log failures."""
+        results = await asyncio.gather(
+            *(update() for update in updates), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.warning("Error while refreshing cached data: %s", result)
 
-    def request_alarms(self):
+    async def _async_get(self, path, params=None, conditional=False):
+        """Fetch a GroupAlarm endpoint and return status and decoded json.
+
+        Timeouts, connection errors and transient status codes are retried
+        with exponential backoff. Repeated failures open the circuit breaker,
+        which refuses further requests with CircuitOpenError for a while.
+
+        A ``conditional`` request sends the ETag and Last-Modified of the
+        response the cached data came from. If nothing changed since,
+        GroupAlarm can answer with status 304 and no body, which is returned
+        without data. The validators of a new response are only used once
+        the update it belongs to succeeded.
+        """
+        if not self._breaker.allow_request():
+            raise CircuitOpenError()
+
+        headers = self.request_headers
+        key = _validator_key(path, params)
+        if conditional and (validators := self._validators.get(key)):
+            headers = {**headers, **validators}
+
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            error = None
+            status = None
+            retry_after = None
+            started = monotonic()
+            try:
+                async with self._session.get(
+                    self._url + path,
+                    headers=headers,
+                    params=params,
+                    timeout=self._timeout,
+                ) as response:
+                    status = response.status
+                    body = await response.read()
+                    if status == 200:
+                        data = json_loads(body)
+                        if conditional:
+                            self._received_validators[key] = _validators(
+                                response.headers
+                            )
+                        self._record_request(path, started, status, len(body))
+                        self._breaker.record_success()
+                        return status, data
+                    if status == 304:
+                        self._record_request(path, started, status)
+                        self._breaker.record_success()
+                        return status, None
+                    retry_after = parse_retry_after(response.headers.get(RETRY_AFTER))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+                error = ex
+
+            self._record_request(path, started, status)
+            if error is None and status not in RETRY_STATUSES:
+                return status, None
+            if attempt == RETRY_ATTEMPTS or (
+                retry_after is not None
+                and retry_after > RETRY_BACKOFF_MAX.total_seconds()
+            ):
+                break
+            self.stats.record_retry(path)
+            await asyncio.sleep(retry_delay(attempt, retry_after))
+
+        if self._breaker.record_failure(retry_after):
+            _LOGGER.warning(
+                "Requests to %s failed repeatedly, pausing GroupAlarm requests",
+                path,
+            )
+        if error is not None:
+            raise error
+        return status, None
+
+    def _record_request(self, path, started, status, size=0):
+        """Record the latency of a request started at the given time."""
+        self.stats.record_request(path, (monotonic() - started) * 1000, status, size)
+
+    async def _async_paginate(self, path, key, conditional=False, params=None):
+        """Yield the records of a paginated endpoint one page at a time.
+
+        ``params`` filter the records and are sent with every page. With
+        ``conditional`` the first page is requested conditionally.
+        Raises GroupAlarmRequestError if a page can not be fetched, which
+        includes status 304 if the first page did not change.
+
+        Paging stops at a short page, once ``total`` records were received,
+        at a page without any new record or after MAX_PAGES pages, so a
+        server that ignores the page parameter can not keep it going.
+        """
+        page = 1
+        received = 0
+        seen = set()
+        while True:
+            status, response = await self._async_get(
+                path,
+                {**(params or {}), "page": page, "limit": self.page_size},
+                conditional=conditional and page == 1,
+            )
+            if status != 200:
+                raise GroupAlarmRequestError(status)
+
+            records = response[key]
+            received += len(records)
+            new_records = [record for record in records if record["id"] not in seen]
+            if not new_records and page > 1:
+                _LOGGER.debug("Page %d of %s brought no new records", page, path)
+                return
+            seen.update(record["id"] for record in new_records)
+            for record in new_records:
+                yield record
+
+            total = response.get("total")
+            if len(records) < self.page_size or (total is not None and received >= total):
+                return
+            if page >= MAX_PAGES:
+                _LOGGER.warning("Stopped reading %s after %d pages", path, page)
+                return
+            page += 1
+
+    @property
+    def alarms_path(self):
+        """Return the API path of the alarm list."""
+        if self.organization_ids:
+            return ORGANIZATION_ALARMS_PATH
         if self.only_own_alarms:
-            url = GROUPALARM_URL + "/alarms/alarmed"
-        else:
-            url = GROUPALARM_URL + "/alarms/user"
-        _LOGGER.debug("Using alarm url: %s", url)
-        alarms = requests.get(url=url, headers=self.request_headers, timeout=DEFAULT_TIMEOUT)
-        _LOGGER.debug("Getting alarms returned: %s", alarms.content)
-        return alarms.status_code, alarms.json()
-
-    def request_user(self):
-        response = requests.get(url=GROUPALARM_URL + "/user", headers=self.request_headers, timeout=DEFAULT_TIMEOUT)
-        _LOGGER.debug("Getting user returned: %s", response.content)
-        return response.status_code, response.json()
-    
-    def request_organizations(self):
+            return "/alarms/alarmed"
+        return "/alarms/user"
+
+    async def request_alarms(self):
+        """Fetch the alarms of the user, newest first, as Alarm objects.
+
+        With organizations selected, the alarms of each of them are fetched
+        concurrently instead and merged.
+        """
+        path = self.alarms_path
+        _LOGGER.debug("Using alarm url: %s", self._url + path)
+        if self.organization_ids:
+            return await self._async_request_organization_alarms(path)
+        return await self._async_request_alarm_list(path, self.alarms)
+
+    async def _async_request_organization_alarms(self, path):
+        """Fetch the alarms of the selected organizations and merge them.
+
+        At most the configured number of requests run at a time. All of
+        them are waited for before an error is raised, so none is left
+        running past the update. The merged alarms are deduplicated and
+        ordered newest first like the alarm list of the user.
+        """
+        known = self.alarms
+
+        async def request(organization_id):
+            async with self._organization_semaphore:
+                return await self._async_request_alarm_list(
+                    path,
+                    None
+                    if known is None
+                    else [
+                        alarm
+                        for alarm in known
+                        if alarm.organization_id == organization_id
+                    ],
+                    {"organization": organization_id},
+                )
+
+        results = await asyncio.gather(
+            *(request(organization_id) for organization_id in self.organization_ids),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for status, _ in results:
+            if status != 200:
+                return status, None
+
+        merged = {}
+        for _, alarms in results:
+            for alarm in alarms:
+                merged.setdefault(alarm.id, alarm)
+        alarms = sorted(
+            merged.values(), key=lambda alarm: (alarm.start, alarm.id), reverse=True
+        )
+        _LOGGER.debug(
+            "Getting alarms of %d organizations returned %d alarms",
+            len(self.organization_ids),
+            len(alarms),
+        )
+        return 200, alarms
+
+    async def _async_request_alarm_list(self, path, known, params=None):
+        """Fetch an alarm list, newest first, as Alarm objects.
+
+        The first page is always read completely. Further pages are only
+        read until an already known alarm shows up; it and the alarms older
+        than it are then taken over from the previous refresh. Known alarms
+        newer than it were just read again, so the ones missing now were
+        deleted and are dropped. Only the alarms of the
+        first page are evaluated, so the feedback of older ones is dropped.
+
+        ``known`` is the list of the last successful refresh, which may be
+        empty, or None if there was none yet. The first page is requested
+        conditionally; if GroupAlarm reports it unchanged, the known alarms
+        are kept without reading or decoding anything.
+        """
+        known_ids = {alarm.id for alarm in known or ()}
+        alarms = []
+        stop_id = None
+        try:
+            async with aclosing(
+                self._async_paginate(
+                    path, "alarms", conditional=True, params=params
+                )
+            ) as records:
+                async for record in records:
+                    if len(alarms) >= self.page_size and record["id"] in known_ids:
+                        stop_id = record["id"]
+                        break
+                    alarms.append(
+                        Alarm.from_api(record, len(alarms) < self.page_size)
+                    )
+        except GroupAlarmRequestError as ex:
+            if ex.status == 304 and known is not None:
+                _LOGGER.debug("Alarms not modified since the last refresh")
+                return 200, known
+            return ex.status, None
+
+        if stop_id is not None:
+            fetched_ids = {alarm.id for alarm in alarms}
+            index = next(
+                index for index, alarm in enumerate(known) if alarm.id == stop_id
+            )
+            alarms.extend(
+                alarm for alarm in known[index:] if alarm.id not in fetched_ids
+            )
+        _LOGGER.debug("Getting alarms returned %d alarms", len(alarms))
+        return 200, alarms
+
+    async def request_user(self):
+        """Fetch the user profile."""
+        status, user = await self._async_get("/user")
+        _LOGGER.debug("Getting user returned status %s", status)
+        return status, user
+
+    async def request_organizations(self):
+        """Fetch the organizations of the user as a map of id to name."""
         organizations = {}
-        response = requests.get(url=GROUPALARM_URL + "/organizations/paginated", headers=self.request_headers, timeout=DEFAULT_TIMEOUT)
-        _LOGGER.debug("Getting organizations returned: %s", response.content)
-        for organization in response.json()["organizations"]:
-            id = organization["id"]
-            name = organization["name"]
-            organizations[id] = name
-        
-        return response.status_code, organizations
+        try:
+            async for organization in self._async_paginate(
+                "/organizations/paginated", "organizations"
+            ):
+                organizations[organization["id"]] = intern(organization["name"])
+        except GroupAlarmRequestError as ex:
+            return ex.status, None
+        _LOGGER.debug(
+            "Getting organizations returned %d organizations", len(organizations)
+        )
 
-    def get_user(self):
-        """Return information about the user."""
+        return 200, organizations
+
+    def ingest_alarms(self, alarms):
+        """Merge alarms received by push into the cached alarm list.
+
+        Known alarms are replaced, new ones are put in front of the list.
+        Return True if the data could be merged.
+
+        The validators of the alarm lists are dropped, so the next poll reads
+        the first page again and reconciles the pushed alarms with
+        GroupAlarm; pushed alarms it doesn't return are dropped.
+        """
+        if self.alarms is None:
+            return False
+
+        path = self.alarms_path
+        self._validators = {
+            key: validators
+            for key, validators in self._validators.items()
+            if key != path and not (isinstance(key, tuple) and key[0] == path)
+        }
+
+        pushed = {alarm["id"]: Alarm.from_api(alarm) for alarm in alarms}
+        merged = [pushed.pop(alarm.id, alarm) for alarm in self.alarms]
+        self.alarms = list(pushed.values()) + merged
+        self._update_snapshot()
+        self._track_alarms()
+        self._update_history()
+        return True
+
+    def as_dict(self):
+        """Return the cached data in a form that can be persisted."""
         return {
-            "id": self.user["id"],
-            "email": self.user["email"],
-            "name": self.user["name"],
-            "surname": self.user["surname"],
+            "alarms": [alarm.as_api() for alarm in self.alarms],
+            "user": self.user,
+            "organizations": list(self.organizations.items()),
+            "latest_update": self.latest_update.isoformat(),
         }
 
-    def __get_last_alarm(self):
-      alarmList = self.alarms["alarms"]
-      if len(alarmList) > 0:
-        return alarmList[0]
+    def history_as_dict(self):
+        """Return the alarm history in a form that can be persisted."""
+        return {"alarms": self.history.as_list()}
+
+    def restore(self, data, history=None):
+        """Restore cached data persisted by as_dict and history_as_dict.
+
+        User and organization data are treated as expired, so they are
+        refreshed in the background after the next successful update.
+        Older versions persisted the history along with the alarms; it is
+        then marked as changed, so it is written to its own store.
+        """
+        self.alarms = [Alarm.from_api(alarm) for alarm in data["alarms"]]
+        self._set_user(data["user"])
+        self.organizations = dict(data["organizations"])
+        self._hub.update_organizations(self.organizations, dt_util.utcnow())
+        # Older versions persisted a naive local time
+        self.latest_update = dt_util.as_utc(
+            datetime.fromisoformat(data["latest_update"])
+        )
+        self.success = True
+        self._update_snapshot()
+        self.tracker.set_baseline(
+            self.alarms[: self.page_size], {alarm.id for alarm in self.alarms}
+        )
+        if history is not None:
+            self.history.restore(history["alarms"], dt_util.utcnow())
+        else:
+            self.history.restore(data.get("history", []), dt_util.utcnow())
+        self._update_history()
+        self.history_changed = history is None and "history" in data
+
+    def _track_alarms(self):
+        """Fire bus events for alarms that changed since the last refresh."""
+        if self.user is None:
+            return
+        self.tracker.async_process(
+            self.alarms[: self.page_size],
+            {alarm.id for alarm in self.alarms},
+            self._hub.organizations,
+            self.user["id"],
+            self.user["email"],
+        )
+
+    def _update_history(self, previous=None):
+        """Add new and changed alarms to the history.
+
+        Only the first page can change between refreshes, so older alarms
+        are only added while the history is still empty. Alarms of the
+        ``previous`` list that GroupAlarm no longer returns, such as deleted
+        or pushed but unknown ones, are removed.
+        """
+        if previous is not None and previous is not self.alarms:
+            alarm_ids = {alarm.id for alarm in self.alarms}
+            if self.history.discard(
+                alarm.id for alarm in previous if alarm.id not in alarm_ids
+            ):
+                self.history_changed = True
+        alarms = self.alarms[: self.page_size] if self.history else self.alarms
+        if self.history.update(alarms, dt_util.utcnow()):
+            self.history_changed = True
+
+    def get_user(self):
+        """Return information about the user."""
+        return self.user
+
+    def _update_snapshot(self, invalidate=False):
+        """Update the snapshots of the newest alarms and the active alarm index.
+
+        Only alarms that changed since the last call are evaluated
+        again. ``invalidate`` forces a full rebuild, e.g. after the user or
+        organization data changed.
+        """
+        if self.alarms is None or self.user is None or self.organizations is None:
+            return
+
+        if invalidate:
+            self._parsed_alarms = {}
+        now = dt_util.utcnow()
+        previous = self._parsed_alarms
+        parsed = {}
+        for alarm in self.alarms[: self.page_size]:
+            known = previous.get(alarm.id)
+            if known is not None and known[0] == alarm:
+                feedback_index, snapshot = known[1], known[2].at(now)
+            else:
+                feedback_index = FeedbackIndex.from_feedback(alarm.feedback)
+                snapshot = AlarmSnapshot.from_alarm(
+                    alarm,
+                    feedback_index,
+                    self._hub.organizations,
+                    self.user["id"],
+                    now,
+                )
+            parsed[alarm.id] = (alarm, feedback_index, snapshot)
+        self._parsed_alarms = parsed
+
+        active = self.active_alarms
+        for alarm_id in active.keys() - parsed.keys():
+            del active[alarm_id]
+        for alarm_id, (_, _, snapshot) in parsed.items():
+            if snapshot.state == STATE_ON:
+                active[alarm_id] = snapshot
+            else:
+                active.pop(alarm_id, None)
+
+        if self.alarms:
+            _, self.feedback_index, self.snapshot = parsed[self.alarms[0].id]
+        else:
+            self.feedback_index = EMPTY_FEEDBACK_INDEX
+            self.snapshot = EMPTY_SNAPSHOT
+
+    def update_states(self):
+        """Evaluate the alarm states at the current time without a request."""
+        self._update_snapshot()
+
+    def next_transition(self, now):
+        """Return the next start or end of the tracked alarms after ``now``."""
+        return min(
+            (
+                time
+                for _, _, snapshot in self._parsed_alarms.values()
+                for time in (snapshot.start, snapshot.end)
+                if time is not None and time > now
+            ),
+            default=None,
+        )
+
+    @property
+    def circuit_breaker_open(self):
+        """Return True while the circuit breaker refuses requests."""
+        return self._breaker.is_open
+
+    @property
+    def circuit_breaker_failures(self):
+        """Return the number of consecutive failures the breaker counted."""
+        return self._breaker.failures
+
+    @property
+    def entity_data(self):
+        """Return the snapshots shown by the entities, for change detection."""
+        return (self.snapshot, tuple(self.active_alarms.values()))
 
     def get_alarm_id(self):
-       alarm = self.__get_last_alarm()
-       if alarm:
-        return alarm["id"]
-       else:
-         return None
-       
+        """Return the id of the last alarm."""
+        return self.snapshot.id
+
     def get_alarm_organization(self):
-       alarm = self.__get_last_alarm()
-       if alarm:
-        return self.get_organization_name_by_id(alarm["organizationID"])
-       else:
-        return None
+        """Return the organization name of the last alarm."""
+        return self.snapshot.organization
 
     def get_alarm_message(self):
-       alarm = self.__get_last_alarm()
-       if alarm:
-        return alarm["message"]
-       else:
-        return None
+        """Return the message of the last alarm."""
+        return self.snapshot.message
 
     def get_alarm_event(self):
-       alarm = self.__get_last_alarm()
-       if alarm:
-          return alarm["event"]["name"]
-       else:
-          return None
-    
+        """Return the event name of the last alarm."""
+        return self.snapshot.event
+
     def get_alarm_start(self):
-       alarm = self.__get_last_alarm()
-       if alarm:
-          return datetime.fromisoformat(alarm["startDate"])
-       else:
-          return None
+        """Return the start of the last alarm."""
+        return self.snapshot.start
 
     def get_alarm_end(self):
-       alarm = self.__get_last_alarm()
-       if alarm and "endDate" in alarm:
-          return datetime.fromisoformat(alarm["endDate"])
-       else:
-          return None
+        """Return the end of the last alarm."""
+        return self.snapshot.end
 
     def get_alarm_feedback(self):
-      alarm = self.__get_last_alarm()
-      try:
-        return self.get_user_feedback(alarm["feedback"])
-      except UserNotAlarmedException:
-        return None
-       
+        """Return the feedback of the user to the last alarm."""
+        return self.snapshot.feedback
 
     def get_alarm_useralarmed(self):
-      alarm = self.__get_last_alarm()
-      try:
-        self.get_user_feedback(alarm["feedback"])
-        return True
-      except UserNotAlarmedException:
-        return False
+        """Return True if the user was alarmed by the last alarm."""
+        return self.snapshot.user_alarmed
 
     def get_alarm_state(self):
-        """Return informations of last alarm."""
-        alarmList = self.alarms["alarms"]
-        if len(alarmList) > 0:
-            alarm = alarmList[0]
-            if (datetime.fromisoformat(alarm["startDate"]) < datetime.now().astimezone()) and ( 
-                (not "endDate" in alarm) or
-                (datetime.fromisoformat(alarm["endDate"]) > datetime.now().astimezone())
-                ):
-                return STATE_ON
-            else:
-                return STATE_OFF
-        else:
-            return STATE_UNKNOWN
+        """Return the state of the last alarm."""
+        return self.snapshot.state
 
     def get_organization_name_by_id(self, organization):
         """Return the name from the given group id."""
         try:
-            return str(self.organizations[organization])
+            return str(self._hub.organizations[organization])
         except KeyError:
             return None
-        
-    def get_user_feedback(self, alarmFeedback):
-        ownId = self.get_user()["id"]
-        for feedback in alarmFeedback:
-            if feedback["userID"] == ownId:
-                if feedback["state"] == "WAITING":
-                    return None
-                else:
-                    return feedback["feedback"]
-        raise UserNotAlarmedException()
-
-    def set_state(self, state_id):
-        """Set the state of the user to the given id."""
-        payload = json.dumps({"Status": {"id": state_id}})
-        headers = {"Content-Type": "application/json"}
 
+    async def async_update_statuses(self):
+        """Fetch the catalog of user statuses, which is only fetched once.
+
+        Return True if the catalog is available.
+        """
+        if self.statuses is not None:
+            return True
+        status, response = await self._async_get(USER_STATUSES_PATH)
+        if status != 200:
+            return False
+        if isinstance(response, dict):
+            response = response.get("statuses", [])
+        self.statuses = {record["id"]: intern(record["name"]) for record in response}
+        _LOGGER.debug("Getting statuses returned %d statuses", len(self.statuses))
+        return True
+
+    def get_status_id(self, name):
+        """Return the id of the status with the given name."""
+        for status_id, status_name in (self.statuses or {}).items():
+            if status_name == name:
+                return status_id
+        return None
+
+    async def async_set_state(self, state_id):
+        """Set the state of the user to the given id.
+
+        Return True if GroupAlarm accepted the change.
+        """
         if not self.api_key:
-            _LOGGER.exception("state can not be set. api-key is missing")
-        else:
-            headers = {"Content-Type": "application/json", "accesskey": self.api_key}
-            try:
-                response = requests.post(
-                    headers=headers,
-                    timeout=DEFAULT_TIMEOUT,
-                    data=payload,
-                )
-                if response.status_code != 200:
-                    _LOGGER.error("Error while setting the state")
-            except requests.exceptions.HTTPError as ex:
-                _LOGGER.error("Error: %s", ex)
+            _LOGGER.error("state can not be set. api-key is missing")
+            return False
+
+        started = monotonic()
+        status = None
+        try:
+            async with self._session.post(
+                self._url + USER_STATUS_PATH,
+                headers=self.request_headers,
+                json={"Status": {"id": state_id}},
+                timeout=self._timeout,
+            ) as response:
+                status = response.status
+                if status != 200:
+                    _LOGGER.error("Error while setting the state: status %s", status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            _LOGGER.error("Error while setting the state: %s", ex)
+        self._record_request(USER_STATUS_PATH, started, status)
+        return status == 200
+
+
+def _validator_key(path, params):
+    """Return the key the validators of a response are stored under.
+
+    Responses of the same path differ by their filters, but not by page.
+    """
+    if not params:
+        return path
+    filters = tuple(
+        sorted(
+            (name, str(value))
+            for name, value in params.items()
+            if name not in ("page", "limit")
+        )
+    )
+    return (path, filters) if filters else path
+
+
+def _validators(headers):
+    """Return the conditional request headers matching a response."""
+    validators = {}
+    if etag := headers.get(ETAG):
+        validators[IF_NONE_MATCH] = etag
+    if last_modified := headers.get(LAST_MODIFIED):
+        validators[IF_MODIFIED_SINCE] = last_modified
+    return validators
+
+
+class GroupAlarmRequestError(Exception):
+    """Error to indicate a request to GroupAlarm was not successful."""
 
-class UserNotAlarmedException(Exception):
-    pass
\ No newline at end of file
+    def __init__(self, status):
+        """Initialize the error with the HTTP status of the response."""
+        super().__init__(f"GroupAlarm returned status {status}")
+        self.status = status
@@ -8,12 +8,91 @@ DEFAULT_SHORT_NAME = "mvpGroupAlarm"
 
 ATTR_NAME = "state"
 ATTR_LATEST_UPDATE = "latest_update_utc"
+ATTR_MESSAGE = "message"
 GROUPALARM_DATA = "groupalarm_data"
 GROUPALARM_COORDINATOR = "groupalarm_coordinator"
 GROUPALARM_NAME = "groupalarm_name"
+GROUPALARM_HUB = "groupalarm_hub"
+
+STORAGE_VERSION = 1
+STORAGE_KEY = "mvpgroupalarm.{}"
+# The alarm history changes rarely and is kept apart from the alarm list, so
+# it is not rewritten on every change of the list.
+HISTORY_STORAGE_KEY = "mvpgroupalarm.{}.history"
+STORE_SAVE_DELAY = 10
+
+EVENT_ALARM_CREATED = f"{DOMAIN}_alarm_created"
+EVENT_ALARM_UPDATED = f"{DOMAIN}_alarm_updated"
+EVENT_ALARM_CLOSED = f"{DOMAIN}_alarm_closed"
+EVENT_ALARM_FEEDBACK_CHANGED = f"{DOMAIN}_alarm_feedback_changed"
+ALARM_HISTORY_SIZE = 20
+# The alarm history shown by the calendar is capped by age and size.
+HISTORY_MAX_AGE = timedelta(days=365)
+HISTORY_MAX_SIZE = 1000
+
+SIGNAL_SCAN_INTERVAL_UPDATED = "mvpgroupalarm_scan_interval_updated_{}"
+SIGNAL_STATS_UPDATED = "mvpgroupalarm_stats_updated_{}"
+
+FEEDBACK_STATE_WAITING = "WAITING"
+FEEDBACK_STATE_POSITIVE = "POSITIVE"
+FEEDBACK_STATE_NEGATIVE = "NEGATIVE"
 
 DEFAULT_TIMEOUT = 10
+# The access key is validated with a single request that fails fast.
+VALIDATION_TIMEOUT = 5
+
+# Failed requests are retried with exponential backoff and jitter. Delays
+# requested by the server via Retry-After are honored up to the maximum,
+# longer ones open the circuit breaker instead.
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = timedelta(seconds=1)
+RETRY_BACKOFF_MAX = timedelta(seconds=30)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_TIMEOUT = timedelta(minutes=5)
+# Cached data is still served this long after the last successful update.
+STALE_DATA_TTL = timedelta(minutes=30)
+DEFAULT_PAGE_SIZE = 50
+# Paginated endpoints are never read beyond this many pages.
+MAX_PAGES = 100
+# Upper bounds in milliseconds of the request latency histogram buckets.
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
 GROUPALARM_URL = "https://app.groupalarm.com/api/v1"
+ORGANIZATION_ALARMS_PATH = "/alarms"
+USER_STATUS_PATH = "/user/status"
+USER_STATUSES_PATH = "/user/statuses"
+# Status changes are sent once the selection settled for this many seconds.
+STATUS_DEBOUNCE_COOLDOWN = 1.0
 
 
 DEFAULT_SCAN_INTERVAL = timedelta(minutes=1)
+
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_PAGE_SIZE = "page_size"
+CONF_PUSH_MODE = "push_mode"
+CONF_ORGANIZATIONS = "organizations"
+CONF_ORGANIZATION_CONCURRENCY = "organization_concurrency"
+
+# With organizations selected, their alarms are fetched concurrently with at
+# most this many requests in flight.
+DEFAULT_ORGANIZATION_CONCURRENCY = 4
+
+# Polling is fast while an alarm is running or started within the active
+# window and backs off by the given factor up to the maximum when idle.
+DEFAULT_MIN_SCAN_INTERVAL = timedelta(seconds=10)
+DEFAULT_MAX_SCAN_INTERVAL = DEFAULT_SCAN_INTERVAL
+ACTIVE_ALARM_WINDOW = timedelta(minutes=30)
+SCAN_INTERVAL_BACKOFF = 2
+# In push mode new alarms arrive by webhook, so polling while idle only
+# reconciles the state at this slow interval.
+PUSH_RECONCILE_INTERVAL = timedelta(minutes=15)
+
+# User and organization data rarely change, so they are cached between
+# alarm polls and only refreshed once expired.
+USER_CACHE_TTL = timedelta(hours=1)
+ORGANIZATIONS_CACHE_TTL = timedelta(hours=6)
+ORGANIZATIONS_MISS_COOLDOWN = timedelta(minutes=5)
+
+# Offset between the polling phases of different config entries.
+REFRESH_STAGGER = timedelta(seconds=1)
@@ -0,0 +1,234 @@
+"""Update coordinator for the GroupAlarm integration."""
+
+from datetime import timedelta
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .connector import GroupAlarmData
+from .hub import GroupAlarmHub
+from .const import (
+    ACTIVE_ALARM_WINDOW,
+    SCAN_INTERVAL_BACKOFF,
+    SIGNAL_SCAN_INTERVAL_UPDATED,
+    SIGNAL_STATS_UPDATED,
+    STORE_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GroupAlarmCoordinator(DataUpdateCoordinator):
+    """Coordinator polling GroupAlarm with an adaptive interval.
+
+    While an alarm is running or has started recently the coordinator polls
+    at the minimum interval. Once idle, the interval is increased step by step
+    up to the maximum interval.
+
+    Refreshes requested by entities or pushes are coalesced and spaced at
+    least the minimum interval apart, so they never poll faster than an
+    active alarm does.
+
+    Every entry polls at its own phase: scheduling its first poll is delayed
+    by a per-entry offset, which the following polls keep, so entries set up
+    together don't poll together. The first refresh at setup and refreshes
+    requested by pushes are not delayed; a refresh during the offset starts
+    the regular schedule right away.
+
+    Alarms start and end at known times, so a timer flips their state at
+    that time without waiting for the next poll.
+
+    The data of the coordinator are the immutable alarm snapshots of the
+    connector, so listeners are only notified when a snapshot changed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connector: GroupAlarmData,
+        hub: GroupAlarmHub,
+        name: str,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        store: Store,
+        history_store: Store,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=max_interval,
+            always_update=False,
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=min_interval.total_seconds(),
+                immediate=True,
+            ),
+        )
+        self.connector = connector
+        self.hub = hub
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.store = store
+        self.history_store = history_store
+        self._unsub_transition: CALLBACK_TYPE | None = None
+        self._shut_down = False
+        self._phase = hub.acquire_phase()
+        self._phased = False
+        self._unsub_phase: CALLBACK_TYPE | None = None
+
+    async def _async_update_data(self):
+        """Fetch new data and adapt the polling interval."""
+        await self.connector.async_update()
+        if self._shut_down:
+            # The entry was unloaded while the refresh ran, a reloaded entry
+            # owns the signals and the store now
+            return self.data
+        async_dispatcher_send(self.hass, SIGNAL_STATS_UPDATED.format(self.name))
+        self._async_adapt_update_interval()
+        if not self.connector.success:
+            raise UpdateFailed("Error while updating GroupAlarm data")
+        if self.connector.entity_data != self.data:
+            self.store.async_delay_save(self.connector.as_dict, STORE_SAVE_DELAY)
+        if self.connector.history_changed:
+            self.history_store.async_delay_save(self._history_data, STORE_SAVE_DELAY)
+        return self.connector.entity_data
+
+    async def async_restore(self) -> bool:
+        """Load the last persisted data, return True if there was any."""
+        if (data := await self.store.async_load()) is None:
+            return False
+        history = await self.history_store.async_load()
+        try:
+            self.connector.restore(data, history)
+        except (KeyError, TypeError, ValueError) as ex:
+            _LOGGER.warning("Ignoring invalid stored GroupAlarm data: %s", ex)
+            return False
+        self._async_adapt_update_interval()
+        self.async_set_updated_data(self.connector.entity_data)
+        if self.connector.history_changed:
+            self.history_store.async_delay_save(self._history_data, STORE_SAVE_DELAY)
+        return True
+
+    def _history_data(self):
+        """Return the history to write and mark it as written."""
+        self.connector.history_changed = False
+        return self.connector.history_as_dict()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners and schedule the next state transition."""
+        super().async_update_listeners()
+        if not self._shut_down:
+            self._async_schedule_transition()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the timers and tasks and write the data a delayed save holds.
+
+        Writing right away releases the connector on unload instead of
+        keeping it referenced until the delayed save runs.
+        """
+        self._shut_down = True
+        self.hub.release_phase(self._phase)
+        await super().async_shutdown()
+        self._async_cancel_transition()
+        self._async_cancel_phase()
+        await self.connector.async_shutdown()
+        if self.connector.latest_update is not None:
+            await self.store.async_save(self.connector.as_dict())
+        if self.connector.history_changed:
+            await self.history_store.async_save(self._history_data())
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll, the first one offset by the phase."""
+        if self._unsub_phase is not None:
+            self._async_cancel_phase()
+        elif not self._phased:
+            self._phased = True
+            offset = self.hub.phase_offset(self._phase, self.min_interval)
+            if offset:
+                self._unsub_phase = async_call_later(
+                    self.hass, offset, self._async_handle_phase
+                )
+                return
+        super()._schedule_refresh()
+
+    @callback
+    def _async_handle_phase(self, _now) -> None:
+        """Schedule the first poll once the offset of the phase passed."""
+        self._unsub_phase = None
+        super()._schedule_refresh()
+
+    @callback
+    def _async_cancel_phase(self) -> None:
+        """Cancel the pending start of the polling phase."""
+        if self._unsub_phase is not None:
+            self._unsub_phase()
+            self._unsub_phase = None
+
+    @callback
+    def _async_cancel_transition(self) -> None:
+        """Cancel the scheduled state transition."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    @callback
+    def _async_schedule_transition(self) -> None:
+        """Schedule the next start or end of a tracked alarm."""
+        self._async_cancel_transition()
+        if (when := self.connector.next_transition(dt_util.utcnow())) is None:
+            return
+        _LOGGER.debug("Next alarm state transition of %s at %s", self.name, when)
+        self._unsub_transition = async_track_point_in_utc_time(
+            self.hass, self._async_handle_transition, when
+        )
+
+    @callback
+    def _async_handle_transition(self, _now) -> None:
+        """Re-evaluate the alarm states locally when an alarm starts or ends."""
+        self._unsub_transition = None
+        self.connector.update_states()
+        self._async_adapt_update_interval()
+        if (data := self.connector.entity_data) != self.data:
+            self.data = data
+            self.async_update_listeners()
+        else:
+            self._async_schedule_transition()
+
+    def _alarm_is_active(self) -> bool:
+        """Return True if any alarm is running or the last one started recently."""
+        if self.connector.alarms is None:
+            return False
+        if self.connector.active_alarms:
+            return True
+        start = self.connector.get_alarm_start()
+        return start is not None and dt_util.utcnow() - start < ACTIVE_ALARM_WINDOW
+
+    def _async_adapt_update_interval(self) -> None:
+        """Poll fast during an alarm and back off while idle."""
+        if self._alarm_is_active():
+            interval = self.min_interval
+        else:
+            interval = min(
+                self.update_interval * SCAN_INTERVAL_BACKOFF, self.max_interval
+            )
+
+        if interval != self.update_interval:
+            _LOGGER.debug("Changing %s update interval to %s", self.name, interval)
+            self.update_interval = interval
+            async_dispatcher_send(
+                self.hass, SIGNAL_SCAN_INTERVAL_UPDATED.format(self.name)
+            )
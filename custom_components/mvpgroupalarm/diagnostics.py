@@ -0,0 +1,55 @@
+"""Diagnostics support for GroupAlarm."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, GROUPALARM_COORDINATOR, GROUPALARM_DATA
+
+TO_REDACT = {CONF_ACCESS_TOKEN, CONF_WEBHOOK_ID, "email", "name", "surname"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hass_data = hass.data[DOMAIN][entry.entry_id]
+    connector = hass_data[GROUPALARM_DATA]
+    coordinator = hass_data[GROUPALARM_COORDINATOR]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+        },
+        "connector": {
+            "success": connector.success,
+            "latest_update": connector.latest_update,
+            "consecutive_failures": connector.consecutive_failures,
+            "circuit_breaker_open": connector.circuit_breaker_open,
+            "circuit_breaker_failures": connector.circuit_breaker_failures,
+            "alarms": len(connector.alarms or ()),
+            "active_alarms": list(connector.active_alarms),
+            "user": async_redact_data(connector.get_user() or {}, TO_REDACT),
+            "recent_alarms": [
+                {
+                    "id": alarm.id,
+                    "organization_id": alarm.organization_id,
+                    "event": alarm.event,
+                    "start": alarm.start,
+                    "end": alarm.end,
+                }
+                for alarm in reversed(connector.tracker.recent_alarms)
+            ],
+        },
+        "stats": connector.stats.as_dict(),
+    }
@@ -0,0 +1,60 @@
+"""Base entity for the GroupAlarm integration."""
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    DEFAULT_NAME,
+    DEFAULT_SHORT_NAME,
+    DOMAIN,
+    GROUPALARM_COORDINATOR,
+    GROUPALARM_DATA,
+    GROUPALARM_NAME,
+)
+
+
+class GroupAlarmEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when it changed."""
+
+    def __init__(self, hass_data):
+        """Initialize the entity."""
+        super().__init__(hass_data[GROUPALARM_COORDINATOR])
+        self._connector = hass_data[GROUPALARM_DATA]
+
+        self._entry_name = hass_data[GROUPALARM_NAME]
+        self._unique_id = f"{DOMAIN}_{self._entry_name}"
+        self._attr_unique_id = self._unique_id
+        self._last_written = None
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info, one device per config entry."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_name)},
+            name=f"{DEFAULT_NAME} {self._entry_name}",
+            manufacturer=DEFAULT_SHORT_NAME,
+        )
+
+    @property
+    def available(self):
+        """Return if state is available."""
+        return self._connector.success and self._connector.latest_update is not None
+
+    def _written_state(self):
+        """Return everything that ends up in the state machine."""
+        return (self.available, self.state, self.extra_state_attributes)
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the initial state when added to hass."""
+        await super().async_added_to_hass()
+        self._last_written = self._written_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value or its attributes changed."""
+        written = self._written_state()
+        if written == self._last_written:
+            return
+        self._last_written = written
+        self.async_write_ha_state()
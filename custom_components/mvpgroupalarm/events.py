@@ -0,0 +1,134 @@
+"""Bus events for alarm changes between GroupAlarm refreshes."""
+
+from __future__ import annotations
+
+from collections import deque
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    ALARM_HISTORY_SIZE,
+    EVENT_ALARM_CLOSED,
+    EVENT_ALARM_CREATED,
+    EVENT_ALARM_FEEDBACK_CHANGED,
+    EVENT_ALARM_UPDATED,
+)
+from .models import Alarm
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _details(alarm: Alarm) -> tuple:
+    """Return the fields whose change makes an alarm updated."""
+    return (alarm.message, alarm.event, alarm.start, alarm.end)
+
+
+def _feedback(alarm: Alarm) -> dict:
+    """Return the feedback of an alarm keyed by user id."""
+    return {user_id: (state, text) for user_id, state, text in alarm.feedback}
+
+
+class AlarmEventTracker:
+    """Diff alarms between refreshes and fire bus events for the changes.
+
+    Only the newest alarms (the first page) are compared, as older alarms are
+    not fetched again. An alarm that moves up into the first page, e.g. when
+    a newer one was deleted, was known before and is not created again, so
+    the ids of all alarms known at the last call are kept as well. The last
+    created alarms are kept in a ring buffer.
+    """
+
+    def __init__(self, hass: HomeAssistant, size: int = ALARM_HISTORY_SIZE) -> None:
+        """Initialize the tracker without a baseline."""
+        self._hass = hass
+        self._known = None
+        self._known_ids = set()
+        self.recent_alarms = deque(maxlen=size)
+
+    def set_baseline(self, alarms: list[Alarm], all_ids: set) -> None:
+        """Remember the given alarms and all known ids without firing events."""
+        self._known = {
+            alarm.id: (_details(alarm), _feedback(alarm)) for alarm in alarms
+        }
+        self._known_ids = all_ids
+        self.recent_alarms.extend(reversed(alarms[: self.recent_alarms.maxlen]))
+
+    def async_process(
+        self,
+        alarms: list[Alarm],
+        all_ids: set,
+        organizations: dict,
+        user_id: int | None,
+        account: str | None,
+    ) -> None:
+        """Fire events for the differences to the previous call.
+
+        ``alarms`` are the alarms to compare and ``all_ids`` the ids of all
+        alarms still known to the connector.
+        """
+        if self._known is None:
+            self.set_baseline(alarms, all_ids)
+            return
+
+        def event_data(alarm: Alarm) -> dict:
+            """Return the common event data of an alarm."""
+            return {
+                "account": account,
+                "alarm_id": alarm.id,
+                "organization_id": alarm.organization_id,
+                "organization": organizations.get(alarm.organization_id),
+                "event": alarm.event,
+                "message": alarm.message,
+                "start": alarm.start.isoformat(),
+                "end": alarm.end.isoformat() if alarm.end is not None else None,
+                "user_alarmed": any(
+                    feedback_user == user_id for feedback_user, _, _ in alarm.feedback
+                ),
+            }
+
+        fire = self._hass.bus.async_fire
+        previous = self._known
+        known_ids = self._known_ids
+        self._known = {}
+        self._known_ids = all_ids
+        for alarm in reversed(alarms):
+            alarm_id = alarm.id
+            details = _details(alarm)
+            feedback = _feedback(alarm)
+            self._known[alarm_id] = (details, feedback)
+
+            if (known := previous.pop(alarm_id, None)) is None:
+                if alarm_id in known_ids:
+                    continue
+                _LOGGER.debug("New alarm %s", alarm_id)
+                self.recent_alarms.append(alarm)
+                fire(EVENT_ALARM_CREATED, event_data(alarm))
+                continue
+
+            known_details, known_feedback = known
+            if details != known_details:
+                fire(EVENT_ALARM_UPDATED, event_data(alarm))
+                if details[3] is not None and known_details[3] is None:
+                    fire(EVENT_ALARM_CLOSED, event_data(alarm))
+
+            # Feedback events only identify the alarm, so the message is not
+            # recorded again for every recipient
+            if feedback != known_feedback:
+                for feedback_user, (state, text) in feedback.items():
+                    if known_feedback.get(feedback_user) != (state, text):
+                        fire(
+                            EVENT_ALARM_FEEDBACK_CHANGED,
+                            {
+                                "account": account,
+                                "alarm_id": alarm_id,
+                                "organization_id": alarm.organization_id,
+                                "user_id": feedback_user,
+                                "feedback_state": state,
+                                "feedback": text,
+                            },
+                        )
+
+        # Alarms that vanished from the list altogether were deleted
+        for alarm_id in previous.keys() - all_ids:
+            fire(EVENT_ALARM_CLOSED, {"account": account, "alarm_id": alarm_id})
@@ -0,0 +1,123 @@
+"""Time-indexed history of GroupAlarm alarms."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from .const import HISTORY_MAX_AGE, HISTORY_MAX_SIZE
+from .models import Alarm
+
+
+class AlarmHistory:
+    """Alarms kept sorted by start time for range queries.
+
+    The alarms are stored without their feedback. Queries bisect the start
+    times, so a window costs O(log n + k). To find alarms that started
+    before the window but still overlap it, the longest duration of a
+    closed alarm is tracked; running alarms are kept apart, as there are
+    only a few of them.
+    """
+
+    def __init__(
+        self, max_size: int = HISTORY_MAX_SIZE, max_age: timedelta = HISTORY_MAX_AGE
+    ) -> None:
+        """Initialize an empty history."""
+        self.max_size = max_size
+        self.max_age = max_age
+        self._keys: list[tuple[datetime, int]] = []
+        self._alarms: dict[int, Alarm] = {}
+        self._running: set[int] = set()
+        self._max_duration = timedelta()
+
+    def __len__(self) -> int:
+        """Return the number of alarms in the history."""
+        return len(self._keys)
+
+    def __contains__(self, alarm_id: int) -> bool:
+        """Return True if the alarm with the given id is in the history."""
+        return alarm_id in self._alarms
+
+    def update(self, alarms: list[Alarm], now: datetime) -> bool:
+        """Add new alarms and update known ones, return True if it changed."""
+        changed = False
+        for alarm in alarms:
+            alarm = replace(alarm, feedback=()) if alarm.feedback else alarm
+            known = self._alarms.get(alarm.id)
+            if known == alarm:
+                continue
+            if known is not None and known.start != alarm.start:
+                self._remove(known)
+                known = None
+            if known is None:
+                insort(self._keys, (alarm.start, alarm.id))
+            self._alarms[alarm.id] = alarm
+            if alarm.end is None:
+                self._running.add(alarm.id)
+            else:
+                self._running.discard(alarm.id)
+                self._max_duration = max(self._max_duration, alarm.end - alarm.start)
+            changed = True
+
+        return self._trim(now) or changed
+
+    def discard(self, alarm_ids) -> bool:
+        """Remove the alarms with the given ids, return True if it changed."""
+        changed = False
+        for alarm_id in alarm_ids:
+            if (alarm := self._alarms.get(alarm_id)) is not None:
+                self._remove(alarm)
+                changed = True
+        return changed
+
+    def _remove(self, alarm: Alarm) -> None:
+        """Remove an alarm from the index."""
+        del self._keys[bisect_left(self._keys, (alarm.start, alarm.id))]
+        del self._alarms[alarm.id]
+        self._running.discard(alarm.id)
+
+    def _trim(self, now: datetime) -> bool:
+        """Drop the alarms that are too old or too many."""
+        cut = max(
+            len(self._keys) - self.max_size,
+            bisect_left(self._keys, (now - self.max_age,)),
+        )
+        if cut <= 0:
+            return False
+        for _, alarm_id in self._keys[:cut]:
+            del self._alarms[alarm_id]
+            self._running.discard(alarm_id)
+        del self._keys[:cut]
+        return True
+
+    def between(self, start: datetime, end: datetime, now: datetime) -> list[Alarm]:
+        """Return the alarms overlapping the window, ordered by start.
+
+        Running alarms are taken to last until ``now``.
+        """
+        low = bisect_left(self._keys, (start - self._max_duration,))
+        high = bisect_left(self._keys, (end,))
+        found = [
+            self._alarms[alarm_id]
+            for _, alarm_id in self._keys[low:high]
+            if alarm_id not in self._running
+            and self._alarms[alarm_id].end > start
+        ]
+        running = [
+            alarm
+            for alarm_id in self._running
+            if (alarm := self._alarms[alarm_id]).start < end
+            and max(alarm.start, now) > start
+        ]
+        if running:
+            found = sorted(found + running, key=lambda alarm: alarm.start)
+        return found
+
+    def as_list(self) -> list[dict]:
+        """Return the history in a form that can be persisted."""
+        return [self._alarms[alarm_id].as_api() for _, alarm_id in self._keys]
+
+    def restore(self, alarms: list[dict], now: datetime) -> None:
+        """Restore a history persisted by as_list."""
+        self.update([Alarm.from_api(alarm) for alarm in alarms], now)
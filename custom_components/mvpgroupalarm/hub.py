@@ -0,0 +1,54 @@
+"""Domain wide hub shared by all GroupAlarm config entries."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, GROUPALARM_HUB, REFRESH_STAGGER
+
+
+class GroupAlarmHub:
+    """Resources shared by the GroupAlarm config entries.
+
+    The hub owns the HTTP session, keeps a shared map of organization names
+    so every organization is only looked up once, and hands out the phases
+    that offset the polling of the entries, so they don't all hit the API at
+    the same time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.session = async_get_clientsession(hass)
+        self.organizations = {}
+        self.organizations_expires = dt_util.utcnow()
+        self._phases = set()
+
+    def update_organizations(self, organizations, expires):
+        """Merge freshly fetched organization names into the shared map."""
+        self.organizations.update(organizations)
+        self.organizations_expires = max(self.organizations_expires, expires)
+
+    def acquire_phase(self):
+        """Return the lowest free phase index and reserve it."""
+        index = next(
+            index for index in range(len(self._phases) + 1) if index not in self._phases
+        )
+        self._phases.add(index)
+        return index
+
+    def release_phase(self, index):
+        """Free a phase index reserved by acquire_phase."""
+        self._phases.discard(index)
+
+    @staticmethod
+    def phase_offset(index, interval):
+        """Return the delay of the first poll of a phase, within the interval."""
+        return (index * REFRESH_STAGGER.total_seconds()) % interval.total_seconds()
+
+
+def async_get_hub(hass: HomeAssistant) -> GroupAlarmHub:
+    """Return the hub of the integration, creating it if necessary."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if GROUPALARM_HUB not in domain_data:
+        domain_data[GROUPALARM_HUB] = GroupAlarmHub(hass)
+    return domain_data[GROUPALARM_HUB]
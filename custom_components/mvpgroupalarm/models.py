@@ -0,0 +1,179 @@
+"""Data models for the GroupAlarm integration."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from sys import intern
+
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNKNOWN
+
+from .const import (
+    FEEDBACK_STATE_NEGATIVE,
+    FEEDBACK_STATE_POSITIVE,
+    FEEDBACK_STATE_WAITING,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Alarm:
+    """Compact projection of an alarm of the GroupAlarm API.
+
+    Only the fields the integration reads are kept. Timestamps are parsed
+    once, repeating strings like event names and feedback states are
+    interned and the feedback is kept as ``(user id, state, text)`` tuples.
+    """
+
+    id: int
+    organization_id: int
+    message: str | None
+    event: str | None
+    start: datetime
+    end: datetime | None
+    feedback: tuple[tuple[int, str, str | None], ...]
+
+    @classmethod
+    def from_api(cls, alarm: dict, with_feedback: bool = True) -> Alarm:
+        """Project a decoded alarm of the GroupAlarm API.
+
+        The feedback can be left out for alarms the integration only keeps
+        for reference and never evaluates.
+        """
+        event = (alarm.get("event") or {}).get("name")
+        end = alarm.get("endDate")
+        return cls(
+            id=alarm["id"],
+            organization_id=alarm["organizationID"],
+            message=alarm.get("message"),
+            event=intern(event) if event is not None else None,
+            start=datetime.fromisoformat(alarm["startDate"]),
+            end=datetime.fromisoformat(end) if end is not None else None,
+            feedback=tuple(
+                (
+                    entry["userID"],
+                    intern(entry["state"]),
+                    _intern_optional(entry.get("feedback")),
+                )
+                for entry in alarm.get("feedback", ())
+            )
+            if with_feedback
+            else (),
+        )
+
+    def as_api(self) -> dict:
+        """Return the alarm in the format of the GroupAlarm API."""
+        alarm = {
+            "id": self.id,
+            "organizationID": self.organization_id,
+            "message": self.message,
+            "event": {"name": self.event},
+            "startDate": self.start.isoformat(),
+            "feedback": [
+                {"userID": user_id, "state": state, "feedback": text}
+                for user_id, state, text in self.feedback
+            ],
+        }
+        if self.end is not None:
+            alarm["endDate"] = self.end.isoformat()
+        return alarm
+
+
+@dataclass(frozen=True, slots=True)
+class FeedbackIndex:
+    """Feedback of an alarm indexed by user id, with counts per state."""
+
+    by_user: dict = field(default_factory=dict)
+    counts: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def from_feedback(cls, feedback: tuple) -> FeedbackIndex:
+        """Index the feedback of an alarm in a single pass."""
+        by_user = {}
+        counts = Counter()
+        for user_id, state, text in feedback:
+            by_user[user_id] = (state, text)
+            counts[state] += 1
+        return cls(by_user, counts)
+
+    def get(self, user_id):
+        """Return the feedback state and text of the given user or None."""
+        return self.by_user.get(user_id)
+
+
+@dataclass(frozen=True, slots=True)
+class AlarmSnapshot:
+    """Immutable, pre-parsed view of the last alarm.
+
+    A snapshot is built once per refresh, so entities only read fields
+    instead of parsing the raw payload on every state write.
+    """
+
+    id: int | None = None
+    organization: str | None = None
+    message: str | None = None
+    event: str | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    state: str = STATE_UNKNOWN
+    user_alarmed: bool = False
+    feedback: str | None = None
+    recipients: int = 0
+    feedback_waiting: int = 0
+    feedback_positive: int = 0
+    feedback_negative: int = 0
+
+    @classmethod
+    def from_alarm(
+        cls,
+        alarm: Alarm,
+        feedback_index: FeedbackIndex,
+        organizations: dict,
+        user_id: int | None,
+        now: datetime,
+    ) -> AlarmSnapshot:
+        """Build a snapshot from an alarm."""
+        own_feedback = feedback_index.get(user_id)
+        feedback = None
+        if own_feedback is not None and own_feedback[0] != FEEDBACK_STATE_WAITING:
+            feedback = own_feedback[1]
+        counts = feedback_index.counts
+
+        organization = organizations.get(alarm.organization_id)
+
+        return cls(
+            id=alarm.id,
+            organization=str(organization) if organization is not None else None,
+            message=alarm.message,
+            event=alarm.event,
+            start=alarm.start,
+            end=alarm.end,
+            state=_state_at(alarm.start, alarm.end, now),
+            user_alarmed=own_feedback is not None,
+            feedback=feedback,
+            recipients=len(feedback_index.by_user),
+            feedback_waiting=counts[FEEDBACK_STATE_WAITING],
+            feedback_positive=counts[FEEDBACK_STATE_POSITIVE],
+            feedback_negative=counts[FEEDBACK_STATE_NEGATIVE],
+        )
+
+    def at(self, now: datetime) -> AlarmSnapshot:
+        """Return the snapshot with its state evaluated at the given time."""
+        if self.start is None:
+            return self
+        state = _state_at(self.start, self.end, now)
+        return self if state == self.state else replace(self, state=state)
+
+
+def _intern_optional(value: str | None) -> str | None:
+    """Intern a string that may be missing."""
+    return intern(value) if value is not None else None
+
+
+def _state_at(start: datetime, end: datetime | None, now: datetime) -> str:
+    """Return whether an alarm is running at the given time."""
+    return STATE_ON if start < now and (end is None or end > now) else STATE_OFF
+
+
+EMPTY_FEEDBACK_INDEX = FeedbackIndex()
+EMPTY_SNAPSHOT = AlarmSnapshot()
@@ -0,0 +1,118 @@
+"""Push ingestion of GroupAlarm alarms through a Home Assistant webhook."""
+
+from datetime import datetime
+import logging
+
+from aiohttp import web
+import voluptuous as vol
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .coordinator import GroupAlarmCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _iso_datetime(value):
+    """Validate an ISO 8601 date with time zone, keeping it as string."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError) as ex:
+        raise vol.Invalid(f"invalid date: {value}") from ex
+    if parsed.tzinfo is None:
+        raise vol.Invalid(f"date without time zone: {value}")
+    return value
+
+
+def _refresh_hint(value):
+    """Accept a JSON object that does not claim to contain alarms."""
+    if not isinstance(value, dict) or value.keys() & {"alarm", "alarms", "id"}:
+        raise vol.Invalid("invalid alarm payload")
+    return value
+
+
+FEEDBACK_SCHEMA = vol.Schema(
+    {
+        vol.Required("userID"): int,
+        vol.Required("state"): str,
+        vol.Optional("feedback"): vol.Any(str, None),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+ALARM_SCHEMA = vol.Schema(
+    {
+        vol.Required("id"): int,
+        vol.Required("startDate"): _iso_datetime,
+        vol.Optional("endDate"): vol.Any(None, _iso_datetime),
+        vol.Required("organizationID"): int,
+        vol.Optional("message", default=""): str,
+        vol.Optional("event", default={"name": None}): vol.Schema(
+            {vol.Optional("name", default=None): vol.Any(str, None)},
+            extra=vol.ALLOW_EXTRA,
+        ),
+        vol.Optional("feedback", default=list): [FEEDBACK_SCHEMA],
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+PUSH_SCHEMA = vol.Any(
+    vol.Schema({vol.Required("alarms"): [ALARM_SCHEMA]}, extra=vol.ALLOW_EXTRA),
+    vol.Schema({vol.Required("alarm"): ALARM_SCHEMA}, extra=vol.ALLOW_EXTRA),
+    ALARM_SCHEMA,
+    # Anything else is only taken as a hint to refresh right away
+    _refresh_hint,
+)
+
+
+def async_register_webhook(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: GroupAlarmCoordinator,
+    webhook_id: str,
+) -> None:
+    """Register the push webhook of a config entry.
+
+    Pushed alarms are merged into the connector's alarm list and written to
+    the entities right away, followed by a refresh from the API.
+    """
+
+    async def handle_webhook(hass: HomeAssistant, webhook_id: str, request):
+        """Handle an alarm pushed to the webhook."""
+        try:
+            payload = PUSH_SCHEMA(await request.json())
+        except (ValueError, vol.Invalid) as ex:
+            _LOGGER.warning("Received invalid GroupAlarm push payload: %s", ex)
+            return web.Response(status=400)
+
+        if "alarms" in payload:
+            alarms = payload["alarms"]
+        elif "alarm" in payload:
+            alarms = [payload["alarm"]]
+        elif "id" in payload:
+            alarms = [payload]
+        else:
+            alarms = []
+
+        _LOGGER.debug("Received %d pushed alarms", len(alarms))
+        if alarms and coordinator.connector.ingest_alarms(alarms):
+            coordinator.async_set_updated_data(coordinator.connector.entity_data)
+        await coordinator.async_request_refresh()
+        return None
+
+    webhook.async_register(
+        hass,
+        entry.domain,
+        f"GroupAlarm {entry.title}",
+        webhook_id,
+        handle_webhook,
+        allowed_methods=["POST"],
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+    _LOGGER.info(
+        "Receiving GroupAlarm pushes for %s at %s",
+        entry.title,
+        webhook.async_generate_path(webhook_id),
+    )
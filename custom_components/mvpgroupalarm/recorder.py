@@ -0,0 +1,11 @@
+"""Integration platform for the recorder."""
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import ATTR_MESSAGE
+
+
+@callback
+def exclude_attributes(hass: HomeAssistant) -> set[str]:
+    """Exclude the alarm messages, which can be long, from being recorded."""
+    return {ATTR_MESSAGE}
@@ -0,0 +1,105 @@
+"""Retry policy and circuit breaker for GroupAlarm API requests."""
+
+from __future__ import annotations
+
+from email.utils import parsedate_to_datetime
+import random
+from time import monotonic
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_TIMEOUT,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+)
+
+
+def retry_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Return the delay before the next attempt.
+
+    A delay requested by the server wins, otherwise exponential backoff with
+    full jitter is used.
+    """
+    if retry_after is not None:
+        return retry_after
+    backoff = min(
+        RETRY_BACKOFF_MAX.total_seconds(),
+        RETRY_BACKOFF_BASE.total_seconds() * 2**attempt,
+    )
+    return random.uniform(0, backoff)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as HTTP date."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - dt_util.utcnow()).total_seconds())
+
+
+class CircuitBreaker:
+    """Stop requesting an API after repeated failures.
+
+    After ``threshold`` consecutive failures the breaker opens and requests
+    are refused until the timeout passed. Then a single trial request is let
+    through and further requests are refused again until its outcome closes
+    the breaker or keeps it open. A trial without a recorded outcome, such as
+    a cancelled request, only blocks requests for another timeout.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        timeout: float = CIRCUIT_BREAKER_TIMEOUT.total_seconds(),
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.threshold = threshold
+        self.timeout = timeout
+        self.failures = 0
+        self._open_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are refused."""
+        return monotonic() < self._open_until
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent."""
+        if self.is_open:
+            return False
+        if self._open_until:
+            # Half-open, refuse other requests while the trial is running
+            self._open_until = monotonic() + self.timeout
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.failures = 0
+        self._open_until = 0.0
+
+    def record_failure(self, retry_after: float | None = None) -> bool:
+        """Count a failed request and return True if the breaker opened."""
+        was_open = self.is_open
+        self.failures += 1
+        if retry_after:
+            self.open(retry_after)
+        if self.failures >= self.threshold:
+            self.open(self.timeout)
+        return self.is_open and not was_open
+
+    def open(self, duration: float) -> None:
+        """Refuse requests for the given number of seconds."""
+        self._open_until = max(self._open_until, monotonic() + duration)
+
+
+class CircuitOpenError(Exception):
+    """Error to indicate a request was refused by the open circuit breaker."""
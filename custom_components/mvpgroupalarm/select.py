@@ -1,17 +1,24 @@
 """Component for the selection of a groupalarm state by the user."""
 
+import asyncio
 import logging
 
-from homeassistant.helpers.typing import ConfigType, HomeAssistantType
+import aiohttp
+
 from homeassistant.components.select import SelectEntity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.typing import ConfigType, HomeAssistantType
 
 from .const import (
     DEFAULT_SHORT_NAME,
-    GROUPALARM_NAME,
     DOMAIN,
-    GROUPALARM_COORDINATOR,
-    GROUPALARM_DATA,
+    STATUS_DEBOUNCE_COOLDOWN,
 )
+from .entity import GroupAlarmEntity
+from .retry import CircuitOpenError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,69 +35,111 @@ async def async_setup_entry(
     )
 
 
-class GroupAlarmStateSelect(SelectEntity):
-    """implementation of a select unit for the groupalarm status of the user."""
+class GroupAlarmStateSelect(GroupAlarmEntity, SelectEntity, RestoreEntity):
+    """implementation of a select unit for the groupalarm status of the user.
+
+    A selected status is shown right away and sent once the selection
+    settled, so only the last of several quick changes reaches GroupAlarm.
+    If GroupAlarm rejects it, the last confirmed status is shown again.
+    """
+
+    _attr_icon = "mdi:clock-time-nine-outline"
 
     def __init__(self, hass_data):
         """Initialize the sensor."""
-        self._connector = hass_data[GROUPALARM_DATA]
-        self._coordinator = hass_data[GROUPALARM_COORDINATOR]
-        self._name = f"{DEFAULT_SHORT_NAME} User Status"
-        self._unique_id = f"{DOMAIN}_{hass_data[GROUPALARM_NAME]}_user_status"
-
-    def select_option(self, option: str) -> None:
-        """Change the selected option."""
-        _LOGGER.info("Status: %s", option)
-        id = self._connector.get_state_if_from_name(option)
-        _LOGGER.debug("Status Id: %s", id)
-        self._connector.set_status(id)
+        super().__init__(hass_data)
+        self._attr_name = f"{DEFAULT_SHORT_NAME} User Status"
+        self._attr_unique_id = f"{self._attr_unique_id}_user_status"
+        self._attr_current_option = None
+        self._confirmed_option = None
+        self._pending_option = None
+        self._statuses_task = None
+        self._debouncer = None
 
     async def async_added_to_hass(self) -> None:
-        """Set up a listener and load data."""
-        self.async_on_remove(
-            self._coordinator.async_add_listener(self.async_write_ha_state)
+        """Restore the last status and load the status catalog."""
+        last_state = await self.async_get_last_state()
+        if last_state is not None and last_state.state not in (
+            STATE_UNKNOWN,
+            STATE_UNAVAILABLE,
+        ):
+            self._attr_current_option = self._confirmed_option = last_state.state
+
+        self._debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=STATUS_DEBOUNCE_COOLDOWN,
+            immediate=False,
+            function=self._async_send_option,
         )
-
-    async def async_update(self):
-        """Schedule a custom update via the common entity update service."""
-        await self._coordinator.async_request_refresh()
-
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return self._name
-
-    # @property
-    # def options(self):
-    #     """Return the state of the sensor."""
-    #     return self._connector.get_all_states()
+        self.async_on_remove(self._debouncer.async_cancel)
+        self.async_on_remove(self._async_cancel_statuses)
+        await super().async_added_to_hass()
+        self._async_load_statuses()
 
     @property
-    def current_option(self):
-        """Return the selected entity option to represent the entity state."""
-        return self._connector.get_state()
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend."""
-        return "mdi:clock-time-nine-outline"
-
-    @property
-    def unique_id(self):
-        """Return a unique ID."""
-        return self._unique_id
-
-    @property
-    def extra_state_attributes(self):
-        """Return entity specific state attributes."""
-        return self._connector.get_state_attributes()
-
-    @property
-    def should_poll(self) -> bool:
-        """Entities do not individually poll."""
-        return True
+    def options(self):
+        """Return the names of the available statuses."""
+        return list((self._connector.statuses or {}).values())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Retry loading the status catalog if it is still missing."""
+        self._async_load_statuses()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_load_statuses(self) -> None:
+        """Load the status catalog in the background unless it is cached."""
+        if self._connector.statuses is not None or (
+            self._statuses_task is not None and not self._statuses_task.done()
+        ):
+            return
+        self._statuses_task = self.hass.async_create_background_task(
+            self._async_update_statuses(), "mvpgroupalarm status catalog"
+        )
 
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        return self._connector.success and self._connector.latest_update is not None
+    @callback
+    def _async_cancel_statuses(self) -> None:
+        """Stop loading the status catalog when the entity is removed."""
+        if self._statuses_task is not None and not self._statuses_task.done():
+            self._statuses_task.cancel()
+        self._statuses_task = None
+
+    async def _async_update_statuses(self) -> None:
+        """Fetch the status catalog and show the options."""
+        try:
+            if not await self._connector.async_update_statuses():
+                return
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as ex:
+            _LOGGER.warning("Error while loading the GroupAlarm statuses: %s", ex)
+            return
+        self.async_write_ha_state()
+
+    async def async_select_option(self, option: str) -> None:
+        """Show the selected status right away and send it debounced."""
+        _LOGGER.info("Status: %s", option)
+        self._pending_option = option
+        self._attr_current_option = option
+        self.async_write_ha_state()
+        await self._debouncer.async_call()
+
+    async def _async_send_option(self) -> None:
+        """Send the last selected status, rolling back if it is rejected.
+
+        A status selected while a request is running is sent right after it.
+        """
+        while (option := self._pending_option) is not None:
+            self._pending_option = None
+            if option == self._confirmed_option:
+                continue
+            status_id = self._connector.get_status_id(option)
+            _LOGGER.debug("Status Id: %s", status_id)
+            if status_id is not None and await self._connector.async_set_state(
+                status_id
+            ):
+                self._confirmed_option = option
+            elif self._pending_option is None:
+                _LOGGER.warning("GroupAlarm status %s could not be set", option)
+                self._attr_current_option = self._confirmed_option
+                self.async_write_ha_state()
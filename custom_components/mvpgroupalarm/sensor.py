@@ -2,21 +2,37 @@
 
 import logging
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    MAX_LENGTH_STATE_STATE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.typing import ConfigType, HomeAssistantType
-from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import (
-    DEFAULT_SHORT_NAME,
-    DEFAULT_NAME,
+    ATTR_MESSAGE,
     DOMAIN,
     GROUPALARM_COORDINATOR,
     GROUPALARM_DATA,
-    GROUPALARM_NAME,
+    SIGNAL_SCAN_INTERVAL_UPDATED,
+    SIGNAL_STATS_UPDATED,
 )
+from .entity import GroupAlarmEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+ALARM_UNIQUE_ID = "_mvpga_alarm_"
+ALARM_FEEDBACK_UNIQUE_ID = "_mvpga_alarm_feedback_"
+
 
 async def async_setup_entry(
     hass: HomeAssistantType, entry: ConfigType, async_add_entities
@@ -32,54 +48,71 @@ async def async_setup_entry(
             GroupAlarmEventSensor(hass_data),
             GroupAlarmMessageSensor(hass_data),
             GroupAlarmUserAlarmedSensor(hass_data),
-            GroupAlarmUserFeedbackSensor(hass_data)      
+            GroupAlarmUserFeedbackSensor(hass_data),
+            GroupAlarmRecipientsSensor(hass_data),
+            GroupAlarmFeedbackWaitingSensor(hass_data),
+            GroupAlarmFeedbackPositiveSensor(hass_data),
+            GroupAlarmFeedbackNegativeSensor(hass_data),
+            GroupAlarmScanIntervalSensor(hass_data),
+            GroupAlarmActiveAlarmsSensor(hass_data),
+            GroupAlarmRefreshDurationSensor(hass_data),
+            GroupAlarmRequestLatencySensor(hass_data),
+            GroupAlarmResponseSizeSensor(hass_data),
+            GroupAlarmRetriesSensor(hass_data),
+            GroupAlarmRequestErrorsSensor(hass_data),
          ],
         False,
     )
 
-class GroupAlarmAbstractSensor(SensorEntity):
-    """Implementation of a GroupAlarm sensor."""
+    # Sensors per active alarm, added and removed as alarms come and go
+    connector = hass_data[GROUPALARM_DATA]
+    coordinator = hass_data[GROUPALARM_COORDINATOR]
+    alarm_sensors = {}
 
-    def __init__(self, hass_data):
-        """Initialize the sensor."""
-        self._connector = hass_data[GROUPALARM_DATA]
-        self._coordinator = hass_data[GROUPALARM_COORDINATOR]
+    entity_registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(
+        entity_registry, entry.entry_id
+    ):
+        if ALARM_UNIQUE_ID in entity_entry.unique_id:
+            alarm_id = int(entity_entry.unique_id.rpartition("_")[2])
+            if alarm_id not in connector.active_alarms:
+                entity_registry.async_remove(entity_entry.entity_id)
 
-        self._unique_id = f"{DOMAIN}_{hass_data[GROUPALARM_NAME]}"
+    @callback
+    def _async_update_alarm_sensors():
+        for alarm_id in alarm_sensors.keys() - connector.active_alarms.keys():
+            for sensor in alarm_sensors.pop(alarm_id):
+                if sensor.registry_entry is not None:
+                    entity_registry.async_remove(sensor.entity_id)
+                else:
+                    hass.async_create_task(sensor.async_remove(force_remove=True))
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._connector.get_alarm_state()
+        new_ids = connector.active_alarms.keys() - alarm_sensors.keys()
+        if new_ids:
+            new_sensors = {
+                alarm_id: (
+                    GroupAlarmAlarmSensor(hass_data, alarm_id),
+                    GroupAlarmAlarmFeedbackSensor(hass_data, alarm_id),
+                )
+                for alarm_id in new_ids
+            }
+            alarm_sensors.update(new_sensors)
+            async_add_entities(
+                [sensor for sensors in new_sensors.values() for sensor in sensors]
+            )
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "TODO")},
-            name=DEFAULT_NAME,
-            manufacturer=DEFAULT_SHORT_NAME,
-        )
-
-    async def async_added_to_hass(self) -> None:
-        """Set up a listener and load data."""
-        self.async_on_remove(
-            self._coordinator.async_add_listener(self.async_write_ha_state)
-        )
-
-    async def async_update(self):
-        """Schedule a custom update via the common entity update service."""
-        await self._coordinator.async_request_refresh()
+    _async_update_alarm_sensors()
+    entry.async_on_unload(
+        coordinator.async_add_listener(_async_update_alarm_sensors)
+    )
 
-    @property
-    def should_poll(self) -> bool:
-        """Entities do not individually poll."""
-        return False
+class GroupAlarmAbstractSensor(GroupAlarmEntity, SensorEntity):
+    """Implementation of a GroupAlarm sensor."""
 
     @property
-    def available(self):
-        """Return if state is available."""
-        return self._connector.success and self._connector.latest_update is not None
+    def state(self):
+        """Return the state of the sensor."""
+        return self._connector.snapshot.state
 
 class GroupAlarmOrganizationSensor(GroupAlarmAbstractSensor):
     _attr_name = "mvp-ga-Organization"
@@ -92,7 +125,7 @@ class GroupAlarmOrganizationSensor(GroupAlarmAbstractSensor):
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._connector.get_alarm_organization()
+        return _truncate(self._connector.snapshot.organization)
 
 class GroupAlarmAlarmStartSensor(GroupAlarmAbstractSensor):
     _attr_name = "mvp-ga-Start"
@@ -106,7 +139,7 @@ class GroupAlarmAlarmStartSensor(GroupAlarmAbstractSensor):
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._connector.get_alarm_start()
+        return self._connector.snapshot.start
 
 class GroupAlarmAlarmEndSensor(GroupAlarmAbstractSensor):
     _attr_name = "mvp-ga-End"
@@ -120,7 +153,7 @@ class GroupAlarmAlarmEndSensor(GroupAlarmAbstractSensor):
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._connector.get_alarm_end()
+        return self._connector.snapshot.end
 
 class GroupAlarmUserAlarmedSensor(GroupAlarmAbstractSensor):
     _attr_name = "mvp-ga-User is alarmed"
@@ -132,7 +165,7 @@ class GroupAlarmUserAlarmedSensor(GroupAlarmAbstractSensor):
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._connector.get_alarm_useralarmed()
+        return self._connector.snapshot.user_alarmed
 
 class GroupAlarmUserFeedbackSensor(GroupAlarmAbstractSensor):
     _attr_name = "mvp-ga-Feedback"
@@ -144,7 +177,7 @@ class GroupAlarmUserFeedbackSensor(GroupAlarmAbstractSensor):
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._connector.get_alarm_feedback()
+        return self._connector.snapshot.feedback
 
 class GroupAlarmMessageSensor(GroupAlarmAbstractSensor):
     _attr_name = "mvp-ga-Message"
@@ -155,8 +188,13 @@ class GroupAlarmMessageSensor(GroupAlarmAbstractSensor):
 
     @property
     def state(self):
-        """Return the state of the sensor."""
-        return self._connector.get_alarm_message()
+        """Return the message, shortened to the maximum length of a state."""
+        return _truncate(self._connector.snapshot.message)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the full message, which is not recorded."""
+        return {ATTR_MESSAGE: self._connector.snapshot.message}
 
 class GroupAlarmEventSensor(GroupAlarmAbstractSensor):
     _attr_name = "mvp-ga-Event"
@@ -168,4 +206,331 @@ class GroupAlarmEventSensor(GroupAlarmAbstractSensor):
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._connector.get_alarm_event()
\ No newline at end of file
+        return _truncate(self._connector.snapshot.event)
+
+class GroupAlarmRecipientsSensor(GroupAlarmAbstractSensor):
+    """Sensor for the number of users alarmed by the last alarm."""
+
+    _attr_name = "mvp-ga-Recipients"
+    _attr_icon = "mdi:account-multiple"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_recipients"
+
+    @property
+    def state(self):
+        """Return the number of users alarmed by the last alarm."""
+        return self._connector.snapshot.recipients
+
+class GroupAlarmFeedbackWaitingSensor(GroupAlarmAbstractSensor):
+    """Sensor for the number of recipients of the last alarm without feedback."""
+
+    _attr_name = "mvp-ga-Feedback waiting"
+    _attr_icon = "mdi:account-clock"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_feedback_waiting"
+
+    @property
+    def state(self):
+        """Return the number of recipients without feedback."""
+        return self._connector.snapshot.feedback_waiting
+
+class GroupAlarmFeedbackPositiveSensor(GroupAlarmAbstractSensor):
+    """Sensor for the number of positive feedbacks to the last alarm."""
+
+    _attr_name = "mvp-ga-Feedback positive"
+    _attr_icon = "mdi:account-check"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_feedback_positive"
+
+    @property
+    def state(self):
+        """Return the number of positive feedbacks."""
+        return self._connector.snapshot.feedback_positive
+
+class GroupAlarmFeedbackNegativeSensor(GroupAlarmAbstractSensor):
+    """Sensor for the number of negative feedbacks to the last alarm."""
+
+    _attr_name = "mvp-ga-Feedback negative"
+    _attr_icon = "mdi:account-cancel"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_feedback_negative"
+
+    @property
+    def state(self):
+        """Return the number of negative feedbacks."""
+        return self._connector.snapshot.feedback_negative
+
+class GroupAlarmActiveAlarmsSensor(GroupAlarmAbstractSensor):
+    """Sensor for the number of running alarms."""
+
+    _attr_name = "mvp-ga-Active alarms"
+    _attr_icon = "mdi:alarm-light"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_active_alarms"
+
+    @property
+    def state(self):
+        """Return the number of running alarms."""
+        return len(self._connector.active_alarms)
+
+class GroupAlarmAlarmSensor(GroupAlarmAbstractSensor):
+    """Sensor for a single active alarm, showing its event name.
+
+    The attributes only hold details that stay the same during the alarm,
+    the feedback counts change often and have their own sensor.
+    """
+
+    _attr_icon = "mdi:alarm-light-outline"
+
+    def __init__(self, hass_data, alarm_id):
+        """Initialize the sensor for the given active alarm."""
+        super().__init__(hass_data)
+        self._alarm_id = alarm_id
+        self._snapshot = self._connector.active_alarms[alarm_id]
+        self._attr_name = f"mvp-ga-Alarm {alarm_id}"
+        self._attr_unique_id = f"{self._attr_unique_id}{ALARM_UNIQUE_ID}{alarm_id}"
+
+    @property
+    def state(self):
+        """Return the event name of the alarm."""
+        return _truncate(self._snapshot.event)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the details of the alarm."""
+        snapshot = self._snapshot
+        return {
+            "alarm_id": snapshot.id,
+            "organization": snapshot.organization,
+            ATTR_MESSAGE: snapshot.message,
+            "start": snapshot.start,
+            "end": snapshot.end,
+            "user_alarmed": snapshot.user_alarmed,
+        }
+
+    def _written_state(self):
+        """Pick up the current snapshot of the alarm while it is active."""
+        self._snapshot = self._connector.active_alarms.get(
+            self._alarm_id, self._snapshot
+        )
+        return super()._written_state()
+
+class GroupAlarmAlarmFeedbackSensor(GroupAlarmAlarmSensor):
+    """Sensor for the feedback to a single active alarm."""
+
+    _attr_icon = "mdi:account-check"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data, alarm_id):
+        """Initialize the feedback sensor for the given active alarm."""
+        super().__init__(hass_data, alarm_id)
+        self._attr_name = f"mvp-ga-Alarm {alarm_id} feedback"
+        self._attr_unique_id = f"{self._unique_id}{ALARM_FEEDBACK_UNIQUE_ID}{alarm_id}"
+
+    @property
+    def state(self):
+        """Return the number of positive feedbacks."""
+        return self._snapshot.feedback_positive
+
+    @property
+    def extra_state_attributes(self):
+        """Return the other feedback counts and the feedback of the user."""
+        snapshot = self._snapshot
+        return {
+            "feedback": snapshot.feedback,
+            "recipients": snapshot.recipients,
+            "feedback_waiting": snapshot.feedback_waiting,
+            "feedback_negative": snapshot.feedback_negative,
+        }
+
+class GroupAlarmScanIntervalSensor(GroupAlarmAbstractSensor):
+    """Diagnostic sensor for the current polling interval."""
+
+    _attr_name = "mvp-ga-Polling interval"
+    _attr_icon = "mdi:timer-sync-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_scan_interval"
+
+    async def async_added_to_hass(self) -> None:
+        """Also listen for interval changes, which don't change the data."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SCAN_INTERVAL_UPDATED.format(self.coordinator.name),
+                self._handle_coordinator_update,
+            )
+        )
+
+    @property
+    def state(self):
+        """Return the current effective polling interval in seconds."""
+        return int(self.coordinator.update_interval.total_seconds())
+
+class GroupAlarmStatsSensor(GroupAlarmAbstractSensor):
+    """Diagnostic sensor showing request statistics of the connector."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    async def async_added_to_hass(self) -> None:
+        """Also listen for new statistics, which don't change the data."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_STATS_UPDATED.format(self.coordinator.name),
+                self._handle_coordinator_update,
+            )
+        )
+
+class GroupAlarmRefreshDurationSensor(GroupAlarmStatsSensor):
+    """Diagnostic sensor for the duration of the last refresh."""
+
+    _attr_name = "mvp-ga-Refresh duration"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_refresh_duration"
+
+    @property
+    def state(self):
+        """Return the duration of the last refresh in milliseconds."""
+        return _round(self._connector.stats.refresh.last)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the mean and maximum refresh duration."""
+        refresh = self._connector.stats.refresh
+        return {"mean": _round(refresh.mean), "max": _round(refresh.max)}
+
+class GroupAlarmRequestLatencySensor(GroupAlarmStatsSensor):
+    """Diagnostic sensor for the latency of the last alarm request."""
+
+    _attr_name = "mvp-ga-Request latency"
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_request_latency"
+
+    @property
+    def state(self):
+        """Return the latency of the last alarm request in milliseconds."""
+        stats = self._connector.stats.endpoints.get(self._connector.alarms_path)
+        return None if stats is None else _round(stats.latency.last)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the mean latency per endpoint."""
+        return {
+            path: _round(stats.latency.mean)
+            for path, stats in self._connector.stats.endpoints.items()
+        }
+
+class GroupAlarmResponseSizeSensor(GroupAlarmStatsSensor):
+    """Diagnostic sensor for the bytes received by the last refresh."""
+
+    _attr_name = "mvp-ga-Response size"
+    _attr_icon = "mdi:download-network-outline"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_response_size"
+
+    @property
+    def state(self):
+        """Return the bytes received by the last refresh."""
+        return self._connector.stats.last_refresh_bytes
+
+class GroupAlarmRetriesSensor(GroupAlarmStatsSensor):
+    """Diagnostic sensor for the number of retried requests."""
+
+    _attr_name = "mvp-ga-Request retries"
+    _attr_icon = "mdi:refresh"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_retries"
+
+    @property
+    def state(self):
+        """Return the number of retried requests."""
+        return self._connector.stats.retries
+
+class GroupAlarmRequestErrorsSensor(GroupAlarmStatsSensor):
+    """Diagnostic sensor for the number of failed requests."""
+
+    _attr_name = "mvp-ga-Request errors"
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, hass_data):
+        """Initialize the sensor."""
+        super().__init__(hass_data)
+        self._attr_unique_id = f"{self._attr_unique_id}_mvpga_request_errors"
+
+    @property
+    def state(self):
+        """Return the number of failed requests."""
+        return self._connector.stats.errors
+
+    @property
+    def extra_state_attributes(self):
+        """Return the number of responses per status code."""
+        statuses = {}
+        for stats in self._connector.stats.endpoints.values():
+            for status, count in stats.statuses.items():
+                statuses[str(status)] = statuses.get(str(status), 0) + count
+        return statuses
+
+def _truncate(text):
+    """Shorten a text to the maximum length of a state."""
+    if text is None or len(text) <= MAX_LENGTH_STATE_STATE:
+        return text
+    return text[: MAX_LENGTH_STATE_STATE - 1] + "…"
+
+def _round(value):
+    """Round a value in milliseconds for display."""
+    return None if value is None else round(value, 1)
@@ -0,0 +1,150 @@
+"""Runtime statistics of the requests to the GroupAlarm API."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+
+from .const import LATENCY_BUCKETS
+
+
+class LatencyHistogram:
+    """Histogram of request latencies in milliseconds.
+
+    Every bucket counts the latencies up to its upper bound; the last bucket
+    takes everything above the largest bound.
+    """
+
+    def __init__(self, bounds: tuple[int, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+
+    def record(self, latency: float) -> None:
+        """Add a latency in milliseconds."""
+        self.buckets[bisect_left(self.bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+        self.last = latency
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict:
+        """Return the histogram for diagnostics."""
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "last": self.last,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class EndpointStats:
+    """Statistics of the requests to a single API path."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.bytes = 0
+        self.last_bytes = 0
+        self.errors = 0
+        self.retries = 0
+
+    def as_dict(self) -> dict:
+        """Return the statistics for diagnostics."""
+        return {
+            "latency_ms": self.latency.as_dict(),
+            "statuses": dict(self.statuses),
+            "bytes": self.bytes,
+            "last_bytes": self.last_bytes,
+            "errors": self.errors,
+            "retries": self.retries,
+        }
+
+
+class ConnectorStats:
+    """Request and refresh statistics of a connector.
+
+    Requests are recorded per path, so the pages of an endpoint are counted
+    together. A refresh covers all requests between ``start_refresh`` and
+    ``finish_refresh``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.refresh = LatencyHistogram()
+        self.last_refresh_bytes = 0
+        self.last_refresh_requests = 0
+        self._refresh_bytes = 0
+        self._refresh_requests = 0
+
+    def endpoint(self, path: str) -> EndpointStats:
+        """Return the statistics of a path."""
+        if (stats := self.endpoints.get(path)) is None:
+            stats = self.endpoints[path] = EndpointStats()
+        return stats
+
+    def record_request(
+        self, path: str, latency: float, status: int | None, size: int = 0
+    ) -> None:
+        """Record a request; ``status`` is None if no response arrived.
+
+        Responses other than 200 and 304 Not Modified count as errors.
+        """
+        stats = self.endpoint(path)
+        stats.latency.record(latency)
+        stats.statuses[status if status is not None else "error"] += 1
+        stats.bytes += size
+        stats.last_bytes = size
+        if status not in (200, 304):
+            stats.errors += 1
+        self._refresh_bytes += size
+        self._refresh_requests += 1
+
+    def record_retry(self, path: str) -> None:
+        """Record that a request to a path is retried."""
+        self.endpoint(path).retries += 1
+
+    def start_refresh(self) -> None:
+        """Start counting the requests of a refresh."""
+        self._refresh_bytes = 0
+        self._refresh_requests = 0
+
+    def finish_refresh(self, duration: float) -> None:
+        """Record the duration of a refresh in milliseconds."""
+        self.refresh.record(duration)
+        self.last_refresh_bytes = self._refresh_bytes
+        self.last_refresh_requests = self._refresh_requests
+
+    @property
+    def retries(self) -> int:
+        """Return the number of retries of all paths."""
+        return sum(stats.retries for stats in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests of all paths."""
+        return sum(stats.errors for stats in self.endpoints.values())
+
+    def as_dict(self) -> dict:
+        """Return the statistics for diagnostics."""
+        return {
+            "refresh_ms": self.refresh.as_dict(),
+            "last_refresh_bytes": self.last_refresh_bytes,
+            "last_refresh_requests": self.last_refresh_requests,
+            "endpoints": {
+                path: stats.as_dict() for path, stats in self.endpoints.items()
+            },
+        }
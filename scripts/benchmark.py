@@ -0,0 +1,399 @@
+"""Benchmark the hot paths of the GroupAlarm integration.
+
+Synthetic payloads of several sizes are served by the local fake API of
+``fake_api.py``. For every size the refresh of ``GroupAlarmData``, JSON
+decoding, snapshot building, the accessors and the sensor properties are
+timed, and the memory held per alarm is measured. The results are
+written as JSON so runs can be compared between releases:
+
+    python3 scripts/benchmark.py --output bench.json
+    python3 scripts/benchmark.py --sizes 100x20 2000x200 --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import gc
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fake_api import (  # noqa: E402
+    FakeGroupAlarmApi,
+    build_alarm,
+    build_alarms,
+    build_organizations,
+)
+
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.update_coordinator import (  # noqa: E402
+    DataUpdateCoordinator,
+)
+from homeassistant.util.json import json_loads  # noqa: E402
+
+from custom_components.mvpgroupalarm import sensor  # noqa: E402
+from custom_components.mvpgroupalarm.connector import GroupAlarmData  # noqa: E402
+from custom_components.mvpgroupalarm.const import (  # noqa: E402
+    DEFAULT_PAGE_SIZE,
+    GROUPALARM_COORDINATOR,
+    GROUPALARM_DATA,
+    GROUPALARM_NAME,
+)
+from custom_components.mvpgroupalarm.hub import GroupAlarmHub  # noqa: E402
+from custom_components.mvpgroupalarm.models import (  # noqa: E402
+    Alarm,
+    AlarmSnapshot,
+    FeedbackIndex,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SIZES = ("10x10", "100x50", "1000x100", "2000x200")
+ORGANIZATIONS = 5
+ACCESSORS = (
+    "get_alarm_id",
+    "get_alarm_organization",
+    "get_alarm_message",
+    "get_alarm_event",
+    "get_alarm_start",
+    "get_alarm_end",
+    "get_alarm_feedback",
+    "get_alarm_useralarmed",
+    "get_alarm_state",
+    "get_user",
+)
+# Sensors that show the newest alarm and need nothing but the connector
+SENSORS = (
+    sensor.GroupAlarmAlarmStartSensor,
+    sensor.GroupAlarmAlarmEndSensor,
+    sensor.GroupAlarmOrganizationSensor,
+    sensor.GroupAlarmEventSensor,
+    sensor.GroupAlarmMessageSensor,
+    sensor.GroupAlarmUserAlarmedSensor,
+    sensor.GroupAlarmUserFeedbackSensor,
+    sensor.GroupAlarmRecipientsSensor,
+    sensor.GroupAlarmFeedbackWaitingSensor,
+    sensor.GroupAlarmFeedbackPositiveSensor,
+    sensor.GroupAlarmFeedbackNegativeSensor,
+    sensor.GroupAlarmActiveAlarmsSensor,
+)
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    """Parse a size given as ``<alarms>x<feedback entries per alarm>``."""
+    alarms, _, feedback = value.partition("x")
+    try:
+        return int(alarms), int(feedback or 0)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}") from ex
+
+
+def summarize(name: str, timings: list[float], **extra) -> dict:
+    """Return the statistics of a list of timings in seconds."""
+    return {
+        "name": name,
+        "unit": "s",
+        "runs": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        **extra,
+    }
+
+
+def measure(func, repeat: int) -> list[float]:
+    """Time ``repeat`` calls of a synchronous function."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_memory(build) -> int:
+    """Return the bytes still allocated by the result of ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+async def async_measure(func, repeat: int) -> list[float]:
+    """Time ``repeat`` awaited calls of a coroutine function."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def benchmark_size(
+    hass: HomeAssistant,
+    hub: GroupAlarmHub,
+    api: FakeGroupAlarmApi,
+    alarm_count: int,
+    feedback_count: int,
+    repeat: int,
+    page_size: int,
+) -> list[dict]:
+    """Run all benchmarks for one payload size."""
+    size = {"alarms": alarm_count, "feedback": feedback_count}
+    api.alarms = build_alarms(alarm_count, feedback_count, ORGANIZATIONS)
+    api.organizations = build_organizations(ORGANIZATIONS)
+    results = []
+
+    def new_connector() -> GroupAlarmData:
+        hub.organizations = {}
+        return GroupAlarmData(
+            hass, "benchmark", hub=hub, page_size=page_size, url=api.url
+        )
+
+    # A cold refresh reads every page, user and organizations included
+    async def cold_refresh():
+        connector = new_connector()
+        await connector.async_update()
+        assert connector.success
+
+    results.append(
+        summarize("refresh_cold", await async_measure(cold_refresh, repeat), **size)
+    )
+
+    # A warm refresh of unchanged alarms gets status 304 for the first page
+    connector = new_connector()
+    await connector.async_update()
+    requests = sum(api.requests.values())
+    timings = await async_measure(connector.async_update, repeat)
+    results.append(
+        summarize(
+            "refresh_warm",
+            timings,
+            requests_per_refresh=(sum(api.requests.values()) - requests) / repeat,
+            bytes_per_refresh=connector.stats.last_refresh_bytes,
+            **size,
+        )
+    )
+
+    # A changed first page is read again, further pages only until the first
+    # known alarm. The two lists alternate so their pages stay cached.
+    alarm_lists = [
+        api.alarms,
+        [build_alarm(alarm_count + 1, datetime.now(timezone.utc), feedback_count)]
+        + api.alarms,
+    ]
+
+    requests = sum(api.requests.values())
+    timings = []
+    for index in range(repeat):
+        api.alarms = alarm_lists[(index + 1) % 2]
+        start = time.perf_counter()
+        await connector.async_update()
+        timings.append(time.perf_counter() - start)
+    api.alarms = alarm_lists[0]
+    results.append(
+        summarize(
+            "refresh_changed",
+            timings,
+            requests_per_refresh=(sum(api.requests.values()) - requests) / repeat,
+            bytes_per_refresh=connector.stats.last_refresh_bytes,
+            **size,
+        )
+    )
+
+    page = json.dumps({"alarms": api.alarms[:page_size], "total": alarm_count}).encode()
+    results.append(
+        summarize(
+            "json_decode_stdlib",
+            measure(lambda: json.loads(page), repeat),
+            bytes=len(page),
+            **size,
+        )
+    )
+    results.append(
+        summarize(
+            "json_decode_ha",
+            measure(lambda: json_loads(page), repeat),
+            bytes=len(page),
+            **size,
+        )
+    )
+
+    results.append(
+        summarize(
+            "snapshot_rebuild",
+            measure(lambda: connector._update_snapshot(invalidate=True), repeat),
+            **size,
+        )
+    )
+    results.append(
+        summarize(
+            "snapshot_unchanged",
+            measure(connector._update_snapshot, repeat),
+            **size,
+        )
+    )
+
+    accessors = [getattr(connector, name) for name in ACCESSORS]
+
+    def call_accessors():
+        for accessor in accessors:
+            accessor()
+
+    results.append(
+        summarize(
+            "accessors", measure(call_accessors, repeat), calls=len(accessors), **size
+        )
+    )
+
+    hass_data = {
+        GROUPALARM_DATA: connector,
+        GROUPALARM_COORDINATOR: DataUpdateCoordinator(
+            hass, _LOGGER, name="benchmark"
+        ),
+        GROUPALARM_NAME: "benchmark",
+    }
+    entities = [sensor_class(hass_data) for sensor_class in SENSORS]
+    entities.extend(
+        sensor.GroupAlarmAlarmSensor(hass_data, alarm_id)
+        for alarm_id in connector.active_alarms
+    )
+
+    def evaluate_sensors():
+        for entity in entities:
+            entity._written_state()
+
+    results.append(
+        summarize(
+            "sensor_properties",
+            measure(evaluate_sensors, repeat),
+            entities=len(entities),
+            **size,
+        )
+    )
+
+    raw_alarms = json_loads(page)["alarms"]
+    results.append(
+        summarize(
+            "alarm_projection",
+            measure(lambda: [Alarm.from_api(alarm) for alarm in raw_alarms], repeat),
+            **size,
+        )
+    )
+
+    # Memory held per alarm by the decoded payload and by the compact model
+    now = datetime.now(timezone.utc)
+
+    def snapshots():
+        parsed = []
+        for alarm in raw_alarms:
+            alarm = Alarm.from_api(alarm)
+            feedback_index = FeedbackIndex.from_feedback(alarm.feedback)
+            parsed.append(
+                (
+                    alarm,
+                    feedback_index,
+                    AlarmSnapshot.from_alarm(
+                        alarm, feedback_index, hub.organizations, 1, now
+                    ),
+                )
+            )
+        return parsed
+
+    for name, build in (
+        ("raw_alarm_memory", lambda: json_loads(page)["alarms"]),
+        ("alarm_memory", snapshots),
+    ):
+        allocated = measure_memory(build)
+        results.append(
+            {
+                "name": name,
+                "unit": "B",
+                "per_alarm": allocated / len(raw_alarms) if raw_alarms else 0,
+                "alarms_measured": len(raw_alarms),
+                **size,
+            }
+        )
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run the benchmarks for all sizes and return the report."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hub = GroupAlarmHub(hass)
+        results = []
+        async with FakeGroupAlarmApi() as api:
+            for alarm_count, feedback_count in args.sizes:
+                _LOGGER.info("Benchmarking %d alarms", alarm_count)
+                results.extend(
+                    await benchmark_size(
+                        hass,
+                        hub,
+                        api,
+                        alarm_count,
+                        feedback_count,
+                        args.repeat,
+                        args.page_size,
+                    )
+                )
+        await hass.async_stop(force=True)
+
+    manifest = json.loads(
+        (ROOT / "custom_components/mvpgroupalarm/manifest.json").read_text()
+    )
+    return {
+        "version": manifest["version"],
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "page_size": args.page_size,
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=[parse_size(size) for size in DEFAULT_SIZES],
+        help="payload sizes as <alarms>x<feedback entries per alarm>",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output is None:
+        sys.stdout.write(report + "\n")
+    else:
+        args.output.write_text(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Local fake of the GroupAlarm API serving synthetic payloads.
+
+The server implements the endpoints used by the integration, including
+pagination and ETags, so the connector can be pointed at it with the
+``url`` argument of ``GroupAlarmData``. Latency, server errors and rate limiting can be
+injected to see how the integration copes with a struggling API. Run it on
+its own to develop against it:
+
+    python3 scripts/fake_api.py --alarms 1000 --feedback 100
+    python3 scripts/fake_api.py --latency 2 --error-rate 0.1 --throttle-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+import contextlib
+import hashlib
+from datetime import datetime, timedelta, timezone
+import json
+import logging
+import random
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+API_PATH = "/api/v1"
+USER_ID = 1
+FEEDBACK_STATES = ("WAITING", "POSITIVE", "NEGATIVE")
+EVENTS = ("B1", "B2", "B3", "TH1", "TH2", "RD", "Probealarm")
+STATUSES = ("Available", "On duty", "Not available", "Vacation")
+
+
+def build_user() -> dict:
+    """Return the profile of the synthetic user."""
+    return {
+        "id": USER_ID,
+        "email": "benchmark@example.com",
+        "name": "Bench",
+        "surname": "Mark",
+    }
+
+
+def build_statuses() -> list[dict]:
+    """Return the synthetic status catalog."""
+    return [{"id": index + 1, "name": name} for index, name in enumerate(STATUSES)]
+
+
+def build_organizations(count: int) -> list[dict]:
+    """Return ``count`` synthetic organizations."""
+    return [
+        {"id": 100 + index, "name": f"Organization {index}"} for index in range(count)
+    ]
+
+
+def build_alarm(
+    alarm_id: int,
+    start: datetime,
+    feedback: int,
+    organizations: int = 1,
+    active: bool = False,
+    seed: int | None = None,
+) -> dict:
+    """Return a synthetic alarm with ``feedback`` feedback entries.
+
+    The user of ``build_user`` is always among the recipients.
+    """
+    rng = random.Random(alarm_id if seed is None else seed)
+    alarm = {
+        "id": alarm_id,
+        "organizationID": 100 + alarm_id % organizations,
+        "message": f"Alarm {alarm_id}: " + " ".join(rng.choices(EVENTS, k=8)),
+        "event": {"id": alarm_id % len(EVENTS), "name": rng.choice(EVENTS)},
+        "startDate": start.isoformat(),
+        "feedback": [
+            {
+                "userID": USER_ID + index,
+                "state": rng.choice(FEEDBACK_STATES),
+                "feedback": rng.choice(("", "Komme", "Nicht verfügbar", "5 Minuten")),
+            }
+            for index in range(feedback)
+        ],
+    }
+    if not active:
+        alarm["endDate"] = (start + timedelta(hours=1)).isoformat()
+    return alarm
+
+
+def build_alarms(
+    count: int, feedback: int, organizations: int = 1, active: int = 1
+) -> list[dict]:
+    """Return ``count`` synthetic alarms, newest first.
+
+    The newest ``active`` alarms have no end date yet.
+    """
+    now = datetime.now(timezone.utc)
+    return [
+        build_alarm(
+            count - index,
+            now - timedelta(hours=2 * index),
+            feedback,
+            organizations,
+            active=index < active,
+        )
+        for index in range(count)
+    ]
+
+
+class FakeGroupAlarmApi:
+    """Serve synthetic GroupAlarm payloads from a local aiohttp server.
+
+    ``alarms``, ``user`` and ``organizations`` can be replaced at any time to
+    change what the next requests return; changes made to the lists in place
+    are not picked up, as encoded pages are cached. Every request is counted
+    in ``requests`` by path and every response in ``responses`` by status.
+
+    Each request is delayed by ``latency`` seconds with a normally
+    distributed ``jitter``. A share of ``error_rate`` requests fails with
+    status 500 and a share of ``throttle_rate`` with status 429 and a
+    ``Retry-After`` of ``retry_after`` seconds.
+    """
+
+    def __init__(
+        self,
+        alarms: list[dict] | None = None,
+        organizations: list[dict] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 30,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the server without starting it."""
+        self.alarms = alarms if alarms is not None else []
+        self.user = build_user()
+        self.organizations = (
+            organizations if organizations is not None else build_organizations(1)
+        )
+        self.requests: dict[str, int] = {}
+        self.responses: Counter[int] = Counter()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._runner = None
+        self._payloads: dict[tuple, tuple[bytes, str]] = {}
+        self._organization_alarms: dict[tuple, list[dict]] = {}
+
+    @property
+    def url(self) -> str:
+        """Return the base URL to pass to the connector."""
+        return f"http://{self.host}:{self.port}{API_PATH}"
+
+    def application(self) -> web.Application:
+        """Return the aiohttp application of the fake API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get(API_PATH + "/alarms/alarmed", self._handle_alarms)
+        app.router.add_get(API_PATH + "/alarms/user", self._handle_alarms)
+        app.router.add_get(API_PATH + "/alarms", self._handle_organization_alarms)
+        app.router.add_get(API_PATH + "/user", self._handle_user)
+        app.router.add_get(
+            API_PATH + "/organizations/paginated", self._handle_organizations
+        )
+        app.router.add_get(API_PATH + "/user/statuses", self._handle_statuses)
+        app.router.add_post(API_PATH + "/user/status", self._handle_status)
+        return app
+
+    async def start(self) -> None:
+        """Start serving on the configured host and port."""
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> FakeGroupAlarmApi:
+        """Start the server when used as context manager."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Stop the server when leaving the context."""
+        await self.stop()
+
+    def add_alarm(
+        self,
+        start: datetime,
+        feedback: int = 0,
+        duration: timedelta | None = None,
+    ) -> dict:
+        """Put a new alarm in front of the alarm list and return it.
+
+        The alarm ends ``duration`` after ``start``, it stays active if
+        ``duration`` is None.
+        """
+        alarm_id = max((alarm["id"] for alarm in self.alarms), default=0) + 1
+        alarm = build_alarm(
+            alarm_id, start, feedback, len(self.organizations), active=True
+        )
+        if duration is not None:
+            alarm["endDate"] = (start + duration).isoformat()
+        self.alarms = [alarm, *self.alarms]
+        self._payloads.clear()
+        self._organization_alarms.clear()
+        return alarm
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable,
+    ) -> web.StreamResponse:
+        """Count the request, inject the faults and count the response."""
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(
+                max(0.0, self._random.gauss(self.latency, self.jitter))
+            )
+        draw = self._random.random()
+        if draw < self.error_rate:
+            response = web.json_response({"message": "fault"}, status=500)
+        elif draw < self.error_rate + self.throttle_rate:
+            response = web.json_response(
+                {"message": "throttled"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        else:
+            response = await handler(request)
+        self.responses[response.status] += 1
+        return response
+
+    def _page(self, request: web.Request, key: str, records: list) -> web.Response:
+        """Respond with one page of ``records``.
+
+        Encoded pages are cached by identity of the record list, so the
+        encoding cost does not end up in the measurements. Every page has
+        an ETag; a request with a matching If-None-Match gets status 304.
+        """
+        page = int(request.query.get("page", 1))
+        limit = int(request.query.get("limit", 50))
+        cache_key = (key, id(records), len(records), page, limit)
+        if (cached := self._payloads.get(cache_key)) is None:
+            body = json.dumps(
+                {
+                    key: records[(page - 1) * limit : page * limit],
+                    "total": len(records),
+                }
+            ).encode()
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            cached = self._payloads[cache_key] = (body, etag)
+        body, etag = cached
+        headers = {"ETag": etag}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=body, content_type="application/json", headers=headers
+        )
+
+    async def _handle_alarms(self, request: web.Request) -> web.Response:
+        """Handle a request for the alarm list."""
+        return self._page(request, "alarms", self.alarms)
+
+    async def _handle_organization_alarms(
+        self, request: web.Request
+    ) -> web.Response:
+        """Handle a request for the alarm list of one organization."""
+        organization_id = int(request.query["organization"])
+        cache_key = (id(self.alarms), len(self.alarms), organization_id)
+        if (alarms := self._organization_alarms.get(cache_key)) is None:
+            alarms = self._organization_alarms[cache_key] = [
+                alarm
+                for alarm in self.alarms
+                if alarm["organizationID"] == organization_id
+            ]
+        return self._page(request, "alarms", alarms)
+
+    async def _handle_user(self, request: web.Request) -> web.Response:
+        """Handle a request for the user profile."""
+        return web.json_response(self.user)
+
+    async def _handle_organizations(self, request: web.Request) -> web.Response:
+        """Handle a request for the organization list."""
+        return self._page(request, "organizations", self.organizations)
+
+    async def _handle_statuses(self, request: web.Request) -> web.Response:
+        """Handle a request for the status catalog."""
+        return web.json_response({"statuses": build_statuses()})
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        """Accept a status change of the user."""
+        await request.read()
+        return web.json_response({})
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve synthetic payloads until interrupted."""
+    api = FakeGroupAlarmApi(
+        build_alarms(args.alarms, args.feedback, args.organizations, args.active),
+        build_organizations(args.organizations),
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    async with api:
+        _LOGGER.info("Serving %d alarms at %s", args.alarms, api.url)
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Run the fake API from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--alarms", type=int, default=100)
+    parser.add_argument("--feedback", type=int, default=20)
+    parser.add_argument("--organizations", type=int, default=3)
+    parser.add_argument("--active", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Measure how long GroupAlarm config entries take to set up.
+
+Config entries are validated, set up, reloaded and unloaded one after the
+other in a bare Home Assistant instance against the local fake API of
+``fake_api.py``, which answers after the configured latency. The import
+time of the config flow is measured in a fresh interpreter. The report is
+written as JSON, so runs can be compared between releases:
+
+    python3 scripts/setup_time.py --output setup.json
+    python3 scripts/setup_time.py --entries 20 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import logging
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fake_api import FakeGroupAlarmApi, build_alarms, build_organizations  # noqa: E402
+from soak import INTEGRATION, async_setup_hass, resources  # noqa: E402
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState  # noqa: E402
+from homeassistant.const import (  # noqa: E402
+    CONF_ACCESS_TOKEN,
+    CONF_NAME,
+    CONF_URL,
+    __version__ as HA_VERSION,
+)
+
+from custom_components.mvpgroupalarm.config_flow import validate_input  # noqa: E402
+from custom_components.mvpgroupalarm.const import DOMAIN  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+ORGANIZATIONS = 5
+# Imported before the clock starts, Home Assistant loads them anyway
+IMPORT_PRELUDE = (
+    "import homeassistant.config_entries, homeassistant.helpers.config_validation, "
+    "homeassistant.helpers.update_coordinator, homeassistant.components.webhook"
+)
+
+
+def summarize(timings: list[float]) -> dict:
+    """Return the median and maximum of timings in milliseconds."""
+    return {
+        "count": len(timings),
+        "median": round(statistics.median(timings), 2),
+        "max": round(max(timings), 2),
+    }
+
+
+def measure_import(module: str) -> dict:
+    """Return the import time of a module of the integration.
+
+    The import runs in a fresh interpreter, after the Home Assistant modules
+    every integration needs, so only the cost of the integration is counted.
+    The modules of the integration it pulls in are listed as well.
+    """
+    code = (
+        f"import json, sys, time\n{IMPORT_PRELUDE}\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "print((time.perf_counter() - started) * 1000)\n"
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.splitlines()
+    return {
+        "module": module,
+        "ms": round(float(output[0]), 2),
+        "loads": [
+            name.removeprefix(f"{INTEGRATION}.")
+            for name in json.loads(output[1])
+            if name.startswith(f"{INTEGRATION}.")
+        ],
+    }
+
+
+async def async_timed(coro) -> tuple[float, object]:
+    """Await a coroutine and return its duration in milliseconds and result."""
+    started = time.perf_counter()
+    result = await coro
+    return (time.perf_counter() - started) * 1000, result
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run the measurements and return the report."""
+    imports = [
+        measure_import(f"{INTEGRATION}.config_flow"),
+        measure_import(INTEGRATION),
+    ]
+    timings = {"validate": [], "setup": [], "reload": [], "unload": []}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+        async with FakeGroupAlarmApi(
+            build_alarms(args.alarms, args.feedback, ORGANIZATIONS),
+            build_organizations(ORGANIZATIONS),
+            latency=args.latency,
+        ) as api:
+            validate_requests = 0
+            entries = []
+            for index in range(args.entries):
+                data = {
+                    CONF_ACCESS_TOKEN: f"setup-{index}",
+                    CONF_URL: api.url,
+                }
+                requests = sum(api.requests.values())
+                duration, _ = await async_timed(validate_input(hass, data))
+                timings["validate"].append(duration)
+                validate_requests += sum(api.requests.values()) - requests
+                entry = ConfigEntry(
+                    version=2,
+                    domain=DOMAIN,
+                    title=f"setup{index}@example.com",
+                    data={**data, CONF_NAME: f"setup{index}@example.com"},
+                    source=config_entries.SOURCE_USER,
+                )
+                duration, _ = await async_timed(hass.config_entries.async_add(entry))
+                timings["setup"].append(duration)
+                entries.append(entry)
+
+            setup_failed = [
+                entry.title
+                for entry in entries
+                if entry.state is not ConfigEntryState.LOADED
+            ]
+            for entry in entries:
+                duration, _ = await async_timed(
+                    hass.config_entries.async_reload(entry.entry_id)
+                )
+                timings["reload"].append(duration)
+            for entry in entries:
+                duration, _ = await async_timed(
+                    hass.config_entries.async_unload(entry.entry_id)
+                )
+                timings["unload"].append(duration)
+            # Taken right away, tasks still running now outlived their entry
+            leftover = resources(hass)
+        await hass.async_stop(force=True)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "homeassistant": HA_VERSION,
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "imports": imports,
+        "validate_requests": validate_requests / args.entries,
+        "setup_failed": setup_failed,
+        "ms": {name: summarize(values) for name, values in timings.items()},
+        "after_unload": {
+            "integration_tasks": leftover["integration_tasks"],
+            "integration_timers": leftover["integration_timers"],
+            "entities": leftover["entities"],
+            "domain_data_left": DOMAIN in hass.data,
+        },
+    }
+
+
+def main() -> None:
+    """Measure the setup time from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10)
+    parser.add_argument("--alarms", type=int, default=200)
+    parser.add_argument("--feedback", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output is None:
+        sys.stdout.write(report + "\n")
+    else:
+        args.output.write_text(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,528 @@
+"""Soak test the GroupAlarm integration in accelerated virtual time.
+
+Many config entries are set up in a bare Home Assistant instance against
+the local fake API of ``fake_api.py``, which slows down, fails and throttles
+requests and keeps adding alarms as configured. The event loop skips the
+time it would otherwise spend idle, so days of uptime run in minutes. The
+entries are reloaded periodically. Before they are unloaded at the end,
+an alarm the API doesn't know is pushed to check that the next poll drops
+it again. After the unload, leftover data, timers, tasks, listeners,
+connections and objects are counted. The report is written as JSON:
+
+    python3 scripts/soak.py --entries 50 --hours 72 --output soak.json
+    python3 scripts/soak.py --error-rate 0.2 --throttle-rate 0.1 --latency 3
+
+Durations in the report are virtual; the memory figures include the fake
+API, which runs in the same process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import partial
+import gc
+import json
+import logging
+from pathlib import Path
+import random
+import resource
+import selectors
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fake_api import (  # noqa: E402
+    FakeGroupAlarmApi,
+    build_alarm,
+    build_alarms,
+    build_organizations,
+)
+
+from homeassistant import auth, config_entries, loader  # noqa: E402
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState  # noqa: E402
+from homeassistant.const import (  # noqa: E402
+    CONF_ACCESS_TOKEN,
+    CONF_NAME,
+    CONF_URL,
+    __version__ as HA_VERSION,
+)
+from homeassistant.core import CoreState, HomeAssistant, callback  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity_platform,
+    entity_registry as er,
+    event,
+    issue_registry as ir,
+    restore_state,
+)
+from homeassistant.helpers.entity import DATA_ENTITY_SOURCE  # noqa: E402
+from homeassistant.helpers.aiohttp_client import async_get_clientsession  # noqa: E402
+from homeassistant.helpers.dispatcher import async_dispatcher_connect  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.mvpgroupalarm import connector, retry  # noqa: E402
+from custom_components.mvpgroupalarm.connector import GroupAlarmData  # noqa: E402
+from custom_components.mvpgroupalarm.const import (  # noqa: E402
+    DOMAIN,
+    GROUPALARM_COORDINATOR,
+    GROUPALARM_DATA,
+    SIGNAL_STATS_UPDATED,
+)
+from custom_components.mvpgroupalarm.coordinator import (  # noqa: E402
+    GroupAlarmCoordinator,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+INTEGRATION = f"custom_components.{DOMAIN}"
+INTEGRATION_PATH = str(ROOT / "custom_components" / DOMAIN)
+# Real time the loop waits for I/O before it skips ahead to the next timer
+IO_GRACE = 0.001
+ORGANIZATIONS = 5
+SAMPLE_INTERVAL = timedelta(hours=1)
+PUSH_CHECK_ATTEMPTS = 60
+
+
+class _SkippingSelector:
+    """Selector that advances the virtual clock instead of waiting idle."""
+
+    def __init__(self, selector: selectors.BaseSelector, loop: VirtualTimeLoop):
+        self._selector = selector
+        self._loop = loop
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+    def select(self, timeout=None):
+        """Poll for I/O shortly, then jump to the next timer if idle.
+
+        Nothing is skipped while executor jobs run, as their results arrive
+        through the loop's self pipe as well.
+        """
+        if timeout is not None and timeout <= IO_GRACE or self._loop.jobs:
+            return self._selector.select(timeout)
+        if timeout is None:
+            return self._selector.select(None)
+        target = self._loop.time() + timeout
+        if events := self._selector.select(IO_GRACE):
+            return events
+        self._loop.advance(target - self._loop.time())
+        return []
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock skips the time it would spend idle."""
+
+    def __init__(self) -> None:
+        """Initialize the loop with a virtual clock at real time."""
+        super().__init__()
+        self._offset = 0.0
+        self._selector = _SkippingSelector(self._selector, self)
+        self.jobs = 0
+        self.skipped = 0.0
+        self._epoch = time.time() - self.time()
+
+    def time(self) -> float:
+        """Return the virtual monotonic time."""
+        return super().time() + self._offset
+
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward."""
+        if seconds > 0:
+            self._offset += seconds
+            self.skipped += seconds
+
+    def timestamp(self) -> float:
+        """Return the virtual wall clock time."""
+        return self._epoch + self.time()
+
+    def utcnow(self) -> datetime:
+        """Return the virtual wall clock time as UTC datetime."""
+        return datetime.fromtimestamp(self.timestamp(), timezone.utc)
+
+    def run_in_executor(self, executor, func, *args):
+        """Count the executor jobs that are still running."""
+        future = super().run_in_executor(executor, func, *args)
+        self.jobs += 1
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, _future) -> None:
+        self.jobs -= 1
+
+    def install_clocks(self) -> None:
+        """Point the wall and monotonic clocks of the integration here."""
+        time.time = self.timestamp
+        dt_util.utcnow = self.utcnow
+        event.time_tracker_utcnow = self.utcnow
+        event.time_tracker_timestamp = self.timestamp
+        for module in (connector, retry):
+            module.monotonic = self.time
+
+
+def percentile(values: list[float], percent: int) -> float | None:
+    """Return a percentile of ``values``."""
+    if len(values) < 2:
+        return values[0] if values else None
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def rss_mb() -> float:
+    """Return the current resident set size in MiB."""
+    with open("/proc/self/statm", encoding="ascii") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * resource.getpagesize() / 2**20
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size in MiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def live_objects(*types: type) -> dict[str, int]:
+    """Return the number of live instances per type."""
+    gc.collect()
+    counts = dict.fromkeys((cls.__name__ for cls in types), 0)
+    for obj in gc.get_objects():
+        if isinstance(obj, types):
+            counts[type(obj).__name__] += 1
+    return counts
+
+
+def _is_integration(func) -> bool:
+    """Return True if ``func`` is code or a method of the integration."""
+    owner = getattr(func, "__self__", None)
+    if owner is not None and type(owner).__module__.startswith(INTEGRATION):
+        return True
+    code = getattr(getattr(func, "__func__", func), "__code__", None)
+    return code is not None and code.co_filename.startswith(INTEGRATION_PATH)
+
+
+def _awaits_integration(coro) -> bool:
+    """Return True if a coroutine chain runs code of the integration."""
+    while coro is not None and hasattr(coro, "cr_code"):
+        if coro.cr_code.co_filename.startswith(INTEGRATION_PATH):
+            return True
+        coro = coro.cr_await
+    return False
+
+
+def resources(hass: HomeAssistant) -> dict[str, int]:
+    """Return the resources that entries could leak.
+
+    Timers and tasks are counted in total and for the integration alone, as
+    Home Assistant and the fake API keep some of their own.
+    """
+    timers = [handle for handle in hass.loop._scheduled if not handle.cancelled()]
+    tasks = asyncio.all_tasks(hass.loop)
+    return {
+        "timers": len(timers),
+        "integration_timers": sum(
+            any(
+                _is_integration(getattr(func, "target", func))
+                for func in (handle._callback, *handle._args)
+            )
+            for handle in timers
+        ),
+        "tasks": len(tasks),
+        "integration_tasks": sum(
+            _awaits_integration(task.get_coro()) for task in tasks
+        ),
+        "bus_listeners": sum(hass.bus.async_listeners().values()),
+        "entities": sum(
+            len(platform.entities)
+            for platform in entity_platform.async_get_platforms(hass, DOMAIN)
+        ),
+        "connections_in_use": len(async_get_clientsession(hass).connector._acquired),
+        "threads": threading.active_count(),
+    }
+
+
+def connector_totals(hass: HomeAssistant) -> dict[str, int]:
+    """Return the retries and errors of all connectors."""
+    connectors = [
+        entry_data[GROUPALARM_DATA]
+        for entry_data in hass.data[DOMAIN].values()
+        if isinstance(entry_data, dict)
+    ]
+    return {
+        "retries": sum(data.stats.retries for data in connectors),
+        "errors": sum(data.stats.errors for data in connectors),
+        "alarms": max((len(data.alarms or ()) for data in connectors), default=0),
+    }
+
+
+async def async_setup_hass(config_dir: str) -> HomeAssistant:
+    """Return a running Home Assistant instance with the custom components."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    hass.config.set_time_zone("UTC")
+    loader.async_setup(hass)
+    await ar.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await ir.async_load(hass)
+    await restore_state.async_load(hass)
+    hass.data[DATA_ENTITY_SOURCE] = {}
+    hass.auth = await auth.auth_manager_from_config(
+        hass, [{"type": "homeassistant"}], []
+    )
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    # Webhooks need the HTTP server, keep it off the default port
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    await async_setup_component(
+        hass, "http", {"http": {"server_host": "127.0.0.1", "server_port": port}}
+    )
+    hass.state = CoreState.running
+    return hass
+
+
+async def async_grow(
+    loop: VirtualTimeLoop, api: FakeGroupAlarmApi, args: argparse.Namespace
+) -> None:
+    """Add alarms to the fake API at the configured rate."""
+    rng = random.Random(args.seed)
+    while True:
+        await asyncio.sleep(rng.expovariate(args.growth / 3600))
+        api.add_alarm(
+            loop.utcnow(),
+            args.feedback,
+            timedelta(minutes=rng.uniform(10, 120)),
+        )
+
+
+async def async_sample(hass: HomeAssistant, api: FakeGroupAlarmApi, report: dict):
+    """Record the memory and request count once per virtual hour."""
+    while True:
+        await asyncio.sleep(SAMPLE_INTERVAL.total_seconds())
+        report["samples"].append(
+            {
+                "hour": round(len(report["samples"]) + 1),
+                "rss_mb": round(rss_mb(), 1),
+                "requests": sum(api.requests.values()),
+                **resources(hass),
+            }
+        )
+
+
+async def async_check_push(
+    loop: VirtualTimeLoop, api: FakeGroupAlarmApi, coordinator: GroupAlarmCoordinator
+) -> bool:
+    """Push an alarm the API doesn't know, return True if the next poll drops it.
+
+    Polls failing because of the injected faults are repeated until one
+    succeeds.
+    """
+    data = coordinator.connector
+    alarm_id = max((alarm["id"] for alarm in api.alarms), default=0) + 1_000_000
+    if not data.ingest_alarms([build_alarm(alarm_id, loop.utcnow(), 0, active=True)]):
+        return False
+    for _ in range(PUSH_CHECK_ATTEMPTS):
+        await coordinator.async_refresh()
+        if data.consecutive_failures == 0:
+            break
+        await asyncio.sleep(coordinator.min_interval.total_seconds())
+    return (
+        all(alarm.id != alarm_id for alarm in data.alarms)
+        and alarm_id not in data.history
+    )
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run the soak test and return the report."""
+    loop = asyncio.get_running_loop()
+    loop.install_clocks()
+    started = time.perf_counter()
+    refreshes: list[float] = []
+    report = {"samples": []}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+        baseline = resources(hass)
+        api = FakeGroupAlarmApi(
+            build_alarms(args.alarms, args.feedback, ORGANIZATIONS, active=0),
+            build_organizations(ORGANIZATIONS),
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            seed=args.seed,
+        )
+        await api.start()
+
+        @callback
+        def record_refresh(coordinator: GroupAlarmCoordinator) -> None:
+            refreshes.append(coordinator.connector.stats.refresh.last)
+
+        entries = []
+        for index in range(args.entries):
+            entry = ConfigEntry(
+                version=2,
+                domain=DOMAIN,
+                title=f"soak{index}@example.com",
+                data={
+                    CONF_ACCESS_TOKEN: f"soak-{index}",
+                    CONF_NAME: f"soak{index}@example.com",
+                    CONF_URL: api.url,
+                },
+                source=config_entries.SOURCE_USER,
+            )
+            await hass.config_entries.async_add(entry)
+            entries.append(entry)
+
+        def connect_stats() -> None:
+            for entry in entries:
+                coordinator = hass.data[DOMAIN][entry.entry_id][GROUPALARM_COORDINATOR]
+                entry.async_on_unload(
+                    async_dispatcher_connect(
+                        hass,
+                        SIGNAL_STATS_UPDATED.format(coordinator.name),
+                        partial(record_refresh, coordinator),
+                    )
+                )
+
+        connect_stats()
+        setup_failed = [
+            entry.title
+            for entry in entries
+            if entry.state is not ConfigEntryState.LOADED
+        ]
+        background = [
+            hass.async_create_background_task(async_grow(loop, api, args), "grow"),
+            hass.async_create_background_task(
+                async_sample(hass, api, report), "sample"
+            ),
+        ]
+
+        virtual_start = loop.time()
+        duration = args.hours * 3600
+        reloads = []
+        while (elapsed := loop.time() - virtual_start) < duration:
+            step = duration - elapsed
+            if args.reload_every:
+                step = min(step, args.reload_every * 3600)
+            await asyncio.sleep(step)
+            if loop.time() - virtual_start >= duration:
+                break
+            before = resources(hass)
+            for entry in entries:
+                await hass.config_entries.async_reload(entry.entry_id)
+            connect_stats()
+            reloads.append({"before": before, "after": resources(hass)})
+
+        requests = sum(api.requests.values())
+        virtual_minutes = (loop.time() - virtual_start) / 60
+        totals = connector_totals(hass)
+        push_reconciled = await async_check_push(
+            loop, api, hass.data[DOMAIN][entries[0].entry_id][GROUPALARM_COORDINATOR]
+        )
+
+        for task in background:
+            task.cancel()
+        unloaded = [
+            await hass.config_entries.async_unload(entry.entry_id) for entry in entries
+        ]
+        await hass.async_block_till_done()
+        leftover = resources(hass)
+        objects = live_objects(GroupAlarmData, GroupAlarmCoordinator)
+        await api.stop()
+        await hass.async_stop(force=True)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "homeassistant": HA_VERSION,
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "wall_seconds": round(time.perf_counter() - started, 1),
+        "virtual_hours": round(virtual_minutes / 60, 2),
+        "setup_failed": setup_failed,
+        "requests": requests,
+        "requests_per_minute": round(requests / virtual_minutes, 2),
+        "responses": {str(status): n for status, n in sorted(api.responses.items())},
+        "alarms_served": len(api.alarms),
+        "connector": totals,
+        "push_reconciled": push_reconciled,
+        "refresh_ms": {
+            "count": len(refreshes),
+            "p50": percentile(refreshes, 50),
+            "p99": percentile(refreshes, 99),
+            "max": max(refreshes, default=None),
+        },
+        "rss_mb": {
+            "end": round(rss_mb(), 1),
+            "peak": round(max(peak_rss_mb(), rss_mb()), 1),
+        },
+        "reloads": reloads,
+        "unload": {
+            "ok": all(unloaded),
+            "domain_data_left": DOMAIN in hass.data,
+            "baseline": baseline,
+            "leftover": leftover,
+            "live_objects": objects,
+            "clean": all(unloaded)
+            and DOMAIN not in hass.data
+            and not any(objects.values())
+            and leftover["integration_timers"] == 0
+            and leftover["integration_tasks"] == 0
+            and leftover["entities"] == 0
+            and leftover["connections_in_use"] == 0,
+        },
+        "samples": report["samples"],
+    }
+
+
+def main() -> None:
+    """Run the soak test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument(
+        "--reload-every", type=float, default=6, help="hours, 0 to never reload"
+    )
+    parser.add_argument("--alarms", type=int, default=200)
+    parser.add_argument("--feedback", type=int, default=30)
+    parser.add_argument("--growth", type=float, default=0.5, help="new alarms per hour")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--throttle-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(message)s",
+    )
+    # Injected faults are expected, do not flood the output with them
+    logging.getLogger(INTEGRATION).setLevel(
+        logging.INFO if args.verbose else logging.CRITICAL
+    )
+
+    loop = VirtualTimeLoop()
+    try:
+        report = json.dumps(loop.run_until_complete(run(args)), indent=2)
+    finally:
+        loop.close()
+    if args.output is None:
+        sys.stdout.write(report + "\n")
+    else:
+        args.output.write_text(report + "\n")
+
+
+if __name__ == "__main__":
+    main()